@@ -1,16 +1,19 @@
 """Extracting and storing bookmarks from chromium browsers (currently Chrome, Brave and Edge supported)"""
 
 
-__all__ = ['log_dir', 'bookmarks', 'BookmarkModel', 'ChromiumBrowser', 'ChromeBrowser', 'EdgeBrowser', 'BraveBrowser',
+__all__ = ['log_dir', 'BookmarkModel', 'ChromiumBrowser', 'ChromeBrowser', 'EdgeBrowser', 'BraveBrowser',
            'get_bookmarks_from_browser']
 
 import os
 import sys
-import json
+import mmap
+from functools import lru_cache
+import orjson
 from loguru import logger
 from pathlib import Path
 from typing import Dict, Optional, Literal
-from datetime import date, datetime, timedelta
+from dataclasses import dataclass
+from datetime import date
 
 
 from pydantic import BaseModel, Field
@@ -20,15 +23,57 @@ log_dir = Path("logs")
 log_dir.mkdir(exist_ok=True)
 logger.add(log_dir / "bookmarks.log", rotation="10 MB", level="INFO")
 
-class BookmarkModel(BaseModel):
+# Chrome stores timestamps as microseconds since 1601-01-01 (WebKit epoch)
+_WEBKIT_EPOCH_ORDINAL = date(1601, 1, 1).toordinal()
+_USEC_PER_DAY = 86_400_000_000
+
+# Profile subdirectories that hold caches and site data, never bookmarks
+_SKIP_DIRS = frozenset({
+    "Cache",
+    "Code Cache",
+    "GPUCache",
+    "Service Worker",
+    "IndexedDB",
+    "blob_storage",
+})
+
+
+def _walk_bookmark_files(root: str):
+    """Yield paths of Bookmarks files under root, skipping cache directories."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if is_dir:
+                    if entry.name not in _SKIP_DIRS:
+                        stack.append(entry.path)
+                # Ignore the snapshot files
+                elif entry.name.endswith("Bookmarks") and "Snapshot" not in entry.path:
+                    yield entry.path
+
+@dataclass(slots=True, frozen=True)
+class BookmarkModel:
     """
-    A model representing a bookmark.
+    A bookmark read from a browser's Bookmarks file.
+
+    A plain dataclass rather than a pydantic model: one is built per URL and
+    the fields come straight from the browser's own JSON, so validation only
+    costs time.
     """
 
-    name: str = Field(..., description="The name of the bookmark")
-    url: str = Field(..., description="The URL of the bookmark")
-    folder: str = Field(..., description="The folder of the bookmark")
-    date_added: date = Field(..., description="The date the bookmark was added")
+    name: str  # The name of the bookmark
+    url: str  # The URL of the bookmark
+    folder: str  # The folder of the bookmark
+    date_added: date  # The date the bookmark was added
 
     def __str__(self):
         return f"{self.name} ({self.url}) added on {self.date_added}"
@@ -90,16 +135,9 @@ class ChromiumBrowser(BaseModel):
             raise ValueError(f"Unsupported operating system: {self.operating_system}")
 
     def get_bookmark_files(self):
-        chrome_path = Path(self.user_data_dir_path)
         # find all bookmarks files
-        bookmarks_files = list(chrome_path.glob("**/*Bookmarks"))
+        bookmarks_files = list(_walk_bookmark_files(str(self.user_data_dir_path)))
         logger.info(f"Found {len(bookmarks_files)} bookmarks files")
-        # Ignore the snapshot files
-        bookmarks_files = [
-            file.as_posix()
-            for file in bookmarks_files
-            if "Snapshot" not in file.as_posix()
-        ]
         return bookmarks_files
 
     def extract_bookmark_info(
@@ -107,29 +145,43 @@ class ChromiumBrowser(BaseModel):
         bookmarks_file_path: str,  # path to the bookmarks file
     ) -> list[BookmarkModel]:
         """Extracts bookmark information from a Chrome Bookmarks file."""
-        with open(bookmarks_file_path, "r", encoding="utf-8") as f:
-            bookmarks_data = json.load(f)
+        with open(bookmarks_file_path, "rb") as f:
+            # mmap can't map an empty file; Chrome leaves these behind for unused profiles
+            if os.fstat(f.fileno()).st_size == 0:
+                logger.warning(f"Skipping empty bookmarks file: {bookmarks_file_path}")
+                return []
+            # Parse straight from the mapped pages instead of copying the file into memory first
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                bookmarks_data = orjson.loads(view)
 
         bookmarks = []
+        bookmarks_append = bookmarks.append
+        fromordinal = date.fromordinal
 
-        def traverse_bookmarks(node, folder=None):
-            """Recursively traverses the bookmark tree."""
-            if node["type"] == "url":
-                date_added = self._convert_timestamp(node["date_added"])
-                bookmarks.append(
+        # Walk the tree with an explicit stack instead of recursing per node.
+        # Nodes are pushed in reverse so pops keep the bookmark bar's
+        # depth-first order.
+        stack = list(reversed(bookmarks_data["roots"].items()))
+        while stack:
+            folder, node = stack.pop()
+            node_type = node["type"]
+            if node_type == "url":
+                bookmarks_append(
                     BookmarkModel(
                         name=node["name"],
                         url=node["url"],
                         folder=folder,
-                        date_added=date_added,
+                        # Same conversion as _convert_timestamp, inlined for the hot loop
+                        date_added=fromordinal(
+                            _WEBKIT_EPOCH_ORDINAL + int(node["date_added"]) // _USEC_PER_DAY
+                        ),
                     )
                 )
-            elif node["type"] == "folder":
-                for child in node["children"]:
-                    traverse_bookmarks(child, folder=node["name"])
-
-        for root_name, root_node in bookmarks_data["roots"].items():
-            traverse_bookmarks(root_node, folder=root_name)
+            elif node_type == "folder":
+                folder_name = node["name"]
+                stack.extend(
+                    (folder_name, child) for child in reversed(node["children"])
+                )
 
         return bookmarks
 
@@ -149,11 +201,9 @@ class ChromiumBrowser(BaseModel):
             logger.info(f"Extracted {len(bookmarks)} bookmarks")
         return bookmarks
 
-    def _convert_timestamp(self, timestamp: int) -> datetime:
-        # Convert WebKit timestamp (microseconds since 1601-01-01) to datetime
-        windows_epoch = datetime(1601, 1, 1)
-        delta = timedelta(microseconds=int(timestamp))
-        return (windows_epoch + delta).date()
+    def _convert_timestamp(self, timestamp: int) -> date:
+        # Convert WebKit timestamp (microseconds since 1601-01-01) to a date
+        return date.fromordinal(_WEBKIT_EPOCH_ORDINAL + int(timestamp) // _USEC_PER_DAY)
 
 class ChromeBrowser(ChromiumBrowser):
     name: str = "Chrome"
@@ -187,8 +237,15 @@ def get_bookmarks_from_browser(
 ) -> list[BookmarkModel]:
     """
     Extracts bookmarks from a specified browser.
+
+    Results are cached per browser for the life of the process. Each call
+    returns a new list, so callers may modify it freely.
     """
-    browser_name = browser_name.lower()
+    return list(_load_bookmarks(browser_name.lower()))
+
+@lru_cache(maxsize=None)
+def _load_bookmarks(browser_name: str) -> tuple[BookmarkModel, ...]:
+    # Cached as a tuple of frozen BookmarkModels so no caller can change it
     if browser_name == "chrome":
         browser = ChromeBrowser()
     elif browser_name == "edge":
@@ -197,7 +254,4 @@ def get_bookmarks_from_browser(
         browser = BraveBrowser()
     else:
         raise ValueError(f"Unsupported browser: {browser_name}")
-    return browser.extract_bookmarks()
-
-bookmarks = get_bookmarks_from_browser("chrome")
-bookmarks[:10]
+    return tuple(browser.extract_bookmarks())
@@ -3,10 +3,11 @@
 This module handles exporting Twitter bookmarks and extracting tweet IDs.
 """
 
-import json
+import re
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict
+import orjson
 from twitter.account import Account
 
 from mindvault.core.config import settings
@@ -14,6 +15,9 @@ from mindvault.core.logger_setup import get_logger
 
 logger = get_logger(__name__)
 
+# Matches the tweet ID in timeline entry IDs such as "tweet-1234567890"
+_TWEET_ID_RE = re.compile(r"\btweet-(\d+)")
+
 class BookmarksExporter:
     """Handles exporting Twitter bookmarks and extracting tweet IDs.
     
@@ -54,8 +58,8 @@ class BookmarksExporter:
         filename = settings.bookmarks_path / f"bookmarks_{timestamp}.json"
         
         logger.info(f"Saving {len(bookmarks)} bookmarks to {filename}")
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(bookmarks, f, ensure_ascii=False, indent=2)
+        with open(filename, "wb") as f:
+            f.write(orjson.dumps(bookmarks, option=orjson.OPT_INDENT_2))
             
         return filename
 
@@ -73,10 +77,9 @@ class BookmarksExporter:
         for bookmark in bookmarks:
             try:
                 entries = bookmark["data"]["bookmark_timeline_v2"]["timeline"]["instructions"][0]["entries"]
-                for entry in entries:
-                    if "tweet" in entry["entryId"]:
-                        tweet_id = entry["entryId"].split("-")[1]
-                        tweet_ids.append(tweet_id)
+                # Scan all entry IDs of the page in one regex pass
+                entry_ids = "\n".join([entry["entryId"] for entry in entries])
+                tweet_ids.extend(_TWEET_ID_RE.findall(entry_ids))
             except Exception as e:
                 logger.error(f"Error processing bookmark: {e}")
                 continue
@@ -96,8 +99,8 @@ class BookmarksExporter:
         filename = settings.tweet_ids_path / f"tweets_ids_{timestamp}.json"
         
         logger.info(f"Saving {len(tweet_ids)} tweet IDs to {filename}")
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(tweet_ids, f, ensure_ascii=False, indent=2)
+        with open(filename, "wb") as f:
+            f.write(orjson.dumps(tweet_ids, option=orjson.OPT_INDENT_2))
             
         return filename
 
@@ -3,9 +3,20 @@
 This module handles database setup and tweet storage operations.
 """
 
-from typing import Set, Optional
+from typing import Iterable, Set, Optional
 from datetime import datetime, timezone
-from sqlalchemy import create_engine, text, Column, String, DateTime
+from sqlalchemy import (
+    create_engine,
+    event,
+    insert,
+    select,
+    text,
+    Column,
+    String,
+    DateTime,
+)
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session, sessionmaker, declarative_base
 
 from mindvault.core.config import settings
@@ -13,6 +24,9 @@ from mindvault.core.logger_setup import get_logger
 
 logger = get_logger(__name__)
 
+# Maximum number of bound parameters per IN (...) membership query
+IN_CLAUSE_CHUNK_SIZE = 500
+
 # Create base class for models
 Base = declarative_base()
 
@@ -25,6 +39,8 @@ class Tweet(Base):
     """
     
     __tablename__ = "tweet"
+    # On SQLite, store rows in the primary key b-tree instead of a separate rowid table
+    __table_args__ = {"sqlite_with_rowid": False}
     
     tweet_id: str = Column(String, primary_key=True)
     created_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc))
@@ -33,6 +49,18 @@ class Tweet(Base):
 engine = create_engine(settings.database_url, echo=False)
 SessionLocal = sessionmaker(bind=engine)
 
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+        """Use WAL journaling so commits don't force a full fsync each time,
+        and keep temp tables plus a 64 MB page cache in memory."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-64000")
+        cursor.close()
+
 def create_database() -> None:
     """Create database and required tables."""
     logger.info("Creating database tables")
@@ -49,13 +77,39 @@ def get_existing_tweet_ids() -> Set[str]:
         Set of tweet IDs as strings
     """
     logger.debug("Fetching existing tweet IDs from database")
+    # Stream the IDs in batches instead of materializing every row first
+    with engine.connect().execution_options(stream_results=True, yield_per=10000) as connection:
+        tweet_ids = set(connection.execute(select(Tweet.tweet_id)).scalars())
+    logger.debug(f"Found {len(tweet_ids)} existing tweet IDs")
+    return tweet_ids
+
+def filter_new_tweet_ids(candidates: Iterable[str]) -> Set[str]:
+    """Get the subset of candidate tweet IDs not yet in the database.
+
+    Only the candidates are sent to the database, in chunks of
+    IN_CLAUSE_CHUNK_SIZE, so the cost scales with the candidate set rather
+    than the table size.
+
+    Args:
+        candidates: Tweet IDs to check
+
+    Returns:
+        Set of candidate tweet IDs that are not in the database
+    """
+    candidates = set(candidates)
+    logger.debug(f"Checking {len(candidates)} tweet IDs against database")
+    candidate_list = list(candidates)
+    found: Set[str] = set()
     session = get_db_session()
     try:
-        tweet_ids = set(id_[0] for id_ in session.query(Tweet.tweet_id).all())
+        for start in range(0, len(candidate_list), IN_CLAUSE_CHUNK_SIZE):
+            chunk = candidate_list[start:start + IN_CLAUSE_CHUNK_SIZE]
+            statement = select(Tweet.tweet_id).where(Tweet.tweet_id.in_(chunk))
+            found.update(session.execute(statement).scalars())
     finally:
         session.close()
-    logger.debug(f"Found {len(tweet_ids)} existing tweet IDs")
-    return tweet_ids
+    logger.debug(f"Found {len(found)} of {len(candidates)} tweet IDs in database")
+    return candidates - found
 
 def save_tweet_to_db(tweet_id: str) -> None:
     """Save a tweet record to the database.
@@ -66,7 +120,7 @@ def save_tweet_to_db(tweet_id: str) -> None:
     Raises:
         Exception: If saving to database fails
     """
-    logger.debug(f"Saving tweet {tweet_id} to database")
+    logger.debug("Saving tweet {} to database", tweet_id)
     session = get_db_session()
     try:
         tweet = Tweet(
@@ -80,7 +134,51 @@ def save_tweet_to_db(tweet_id: str) -> None:
         raise
     finally:
         session.close()
-    logger.debug(f"Successfully saved tweet {tweet_id}")
+    logger.debug("Successfully saved tweet {}", tweet_id)
+
+def save_tweet_ids_to_db(tweet_ids: Iterable[str]) -> int:
+    """Save multiple tweet records to the database in a single transaction.
+
+    Tweet IDs that already exist are ignored.
+
+    Args:
+        tweet_ids: IDs of the tweets
+
+    Returns:
+        Number of tweet IDs submitted for insertion
+
+    Raises:
+        Exception: If saving to database fails
+    """
+    rows = [{"tweet_id": tweet_id} for tweet_id in dict.fromkeys(tweet_ids)]
+    if not rows:
+        return 0
+
+    if engine.dialect.name == "postgresql":
+        statement = postgresql_insert(Tweet.__table__).on_conflict_do_nothing(
+            index_elements=["tweet_id"]
+        )
+    elif engine.dialect.name == "sqlite":
+        statement = sqlite_insert(Tweet.__table__).on_conflict_do_nothing(
+            index_elements=["tweet_id"]
+        )
+    else:
+        # No portable ON CONFLICT clause: insert only the IDs not stored yet
+        new_ids = filter_new_tweet_ids(row["tweet_id"] for row in rows)
+        rows = [row for row in rows if row["tweet_id"] in new_ids]
+        if not rows:
+            return 0
+        statement = insert(Tweet.__table__)
+
+    logger.debug(f"Saving {len(rows)} tweets to database")
+    try:
+        with engine.begin() as connection:
+            connection.execute(statement, rows)
+    except Exception as e:
+        logger.error(f"Database error while saving {len(rows)} tweets: {e}")
+        raise
+    logger.debug(f"Successfully saved {len(rows)} tweets")
+    return len(rows)
 
 def get_total_tweets() -> int:
     """Get total number of tweets in the database.
@@ -107,16 +205,16 @@ def get_tweet_by_id(tweet_id: str) -> Optional[Tweet]:
     Returns:
         Tweet record if found, None otherwise
     """
-    logger.debug(f"Fetching tweet {tweet_id} from database")
+    logger.debug("Fetching tweet {} from database", tweet_id)
     session = get_db_session()
     try:
         tweet = session.query(Tweet).filter(Tweet.tweet_id == tweet_id).first()
     finally:
         session.close()
     if tweet:
-        logger.debug(f"Found tweet {tweet_id}")
+        logger.debug("Found tweet {}", tweet_id)
     else:
-        logger.debug(f"Tweet {tweet_id} not found")
+        logger.debug("Tweet {} not found", tweet_id)
     return tweet
     
 if __name__ == "__main__":
@@ -3,11 +3,11 @@ Module for downloading media from Twitter tweets based on media information extr
 """
 
 import asyncio
+import os
+import shutil
 import warnings
 from pathlib import Path
-from typing import AsyncIterator, Dict, List, Optional, Union
-
-import aiofiles
+from typing import AsyncIterator, Dict, List, Optional, Set, Union
 
 from mindvault.bookmarks.twitter.extract import (
     ExtractedMediaList,
@@ -20,22 +20,110 @@ from mindvault.bookmarks.twitter.media_download import (
 )
 from mindvault.core.config import settings
 
+# Large media is written out in windows of this many bytes
+_FLUSH_BYTES = 8 * 1024 * 1024
+
+
+def _is_non_empty_file(file_path: str) -> bool:
+    # One stat call instead of exists() followed by stat()
+    try:
+        return os.stat(file_path).st_size > 0
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+
+
+def _unlink_quietly(file_path: str) -> None:
+    try:
+        os.unlink(file_path)
+    except OSError:
+        pass
+
+
+def _partial_path(file_path: str) -> str:
+    # Media is written here and renamed into place once complete, so an
+    # interrupted write never leaves a truncated file that exists() accepts
+    return file_path + ".part"
+
+
+def _write_file(file_path: str, chunks: List[bytes]) -> None:
+    """Write chunks to file_path, leaving no file behind on failure."""
+    partial_path = _partial_path(file_path)
+    try:
+        with open(partial_path, "wb") as fp:
+            fp.writelines(chunks)
+        os.replace(partial_path, file_path)
+    except BaseException:
+        _unlink_quietly(partial_path)
+        raise
+
+
+def _copy_file(source_path: str, file_path: str) -> None:
+    """Copy source_path to file_path, leaving no file behind on failure."""
+    partial_path = _partial_path(file_path)
+    try:
+        shutil.copyfile(source_path, partial_path)
+        os.replace(partial_path, file_path)
+    except BaseException:
+        _unlink_quietly(partial_path)
+        raise
+
+
+async def _finish_in_thread(func, *args) -> None:
+    """
+    Run func in a worker thread, waiting for it to finish even if cancelled.
+
+    A running thread can't be interrupted, so cleanup after a cancellation
+    would otherwise close or delete a file the thread is still writing.
+    """
+    work = asyncio.ensure_future(asyncio.to_thread(func, *args))
+    try:
+        await asyncio.shield(work)
+    except asyncio.CancelledError:
+        await asyncio.gather(work, return_exceptions=True)
+        raise
+
 
 class FileSystemMediaStore:
     """Filesystem-backed media storage."""
 
-    def __init__(self, base_dir: Union[str, Path]) -> None:
+    def __init__(self, base_dir: Union[str, Path], *, use_thread_for_stat: bool = False) -> None:
         self.base_dir = Path(base_dir)
+        # Per-item paths are built as plain strings; Path objects are only
+        # created for the values handed back to callers
+        self._base_dir_str = str(self.base_dir)
+        # Local stat calls are cheaper than a threadpool hop; only network
+        # mounts, where stat can block, should push them to a thread.
+        self.use_thread_for_stat = use_thread_for_stat
+        # Tweet directories already created, so each is mkdir'd once per store
+        self._created_dirs: Set[str] = set()
 
     async def prepare(self) -> None:
         self.base_dir.mkdir(parents=True, exist_ok=True)
 
+    def _get_path(self, item: ExtractedMedia) -> str:
+        return os.path.join(self._base_dir_str, build_media_key(item))
+
     def get_location(self, item: ExtractedMedia) -> Path:
-        return self.base_dir / build_media_key(item)
+        return Path(self._get_path(item))
 
     async def exists(self, item: ExtractedMedia) -> bool:
-        file_path = self.get_location(item)
-        return file_path.exists() and file_path.stat().st_size > 0
+        file_path = self._get_path(item)
+        if self.use_thread_for_stat:
+            return await asyncio.to_thread(_is_non_empty_file, file_path)
+        return _is_non_empty_file(file_path)
+
+    def _make_tweet_dir(self, file_path: str) -> None:
+        tweet_dir = os.path.dirname(file_path)
+        if tweet_dir not in self._created_dirs:
+            os.makedirs(tweet_dir, exist_ok=True)
+            self._created_dirs.add(tweet_dir)
+
+    async def copy(self, source: ExtractedMedia, item: ExtractedMedia) -> Path:
+        """Copy the stored file of source to the location of item."""
+        file_path = self._get_path(item)
+        self._make_tweet_dir(file_path)
+        await _finish_in_thread(_copy_file, self._get_path(source), file_path)
+        return Path(file_path)
 
     async def save(
         self,
@@ -44,25 +132,50 @@ class FileSystemMediaStore:
         *,
         content_type: Optional[str] = None,
     ) -> Path:
-        file_path = self.get_location(item)
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path = self._get_path(item)
+        self._make_tweet_dir(file_path)
 
+        # Collect the stream and write it from a worker thread in as few hops as
+        # possible: small files in one open/write/close call, large files in
+        # _FLUSH_BYTES windows so memory stays bounded. Chunks are written as
+        # received rather than copied into one buffer first.
+        pending: List[bytes] = []
+        pending_size = 0
+        partial_path = _partial_path(file_path)
+        fp = None
+        completed = False
         try:
-            async with aiofiles.open(file_path, "wb") as fp:
-                async for chunk in stream:
-                    await fp.write(chunk)
+            async for chunk in stream:
+                if not chunk:
+                    continue
+                pending.append(chunk)
+                pending_size += len(chunk)
+                if pending_size >= _FLUSH_BYTES:
+                    if fp is None:
+                        # Opened here rather than in a thread, so a
+                        # cancellation can't leave an open file behind
+                        fp = open(partial_path, "wb")
+                    window, pending, pending_size = pending, [], 0
+                    await _finish_in_thread(fp.writelines, window)
 
-            if file_path.exists() and file_path.stat().st_size == 0:
-                file_path.unlink(missing_ok=True)
-                raise IOError(f"Empty file received for {file_path}")
-
-            return file_path
-        except Exception:
-            try:
-                file_path.unlink(missing_ok=True)
-            except Exception:
-                pass
-            raise
+            if fp is None:
+                if not pending:
+                    raise IOError(f"Empty file received for {file_path}")
+                await _finish_in_thread(_write_file, file_path, pending)
+            else:
+                if pending:
+                    await _finish_in_thread(fp.writelines, pending)
+                await _finish_in_thread(fp.close)
+                os.replace(partial_path, file_path)
+            completed = True
+            return Path(file_path)
+        finally:
+            # Also runs on cancellation, e.g. when a sibling download fails;
+            # no write is in flight by then
+            if fp is not None:
+                fp.close()
+            if not completed:
+                _unlink_quietly(partial_path)
 
 
 async def download_tweet_media(
@@ -82,14 +195,19 @@ async def download_tweet_media(
         media_list: DownloadedMediaList from extract_media_info_from_conversation
         output_dir: Directory to save downloaded media (defaults to settings.media_dir)
         **kwargs: Additional keyword arguments
-            - chunk_size: Size of chunks when downloading files (default: 8192)
+            - chunk_size: Size of chunks when downloading files (default: 1 MiB)
             - max_connections: Maximum number of concurrent connections (default: 50)
-            - max_keepalive_connections: Maximum number of connections to keep alive
-            - keepalive_expiry: Time in seconds to keep a connection alive (default: 5.0)
+            - max_keepalive_connections: Maximum number of connections to keep alive (default: 10)
+            - keepalive_expiry: Time in seconds to keep a connection alive (default: 30.0)
+            - max_concurrent_downloads: Maximum number of downloads in flight
+              (default: 50, or max_connections if lower)
             - max_retries: Maximum number of retry attempts (default: 3)
             - retry_delay: Delay between retries in seconds (default: 1.0)
             - timeout: Timeout for HTTP requests in seconds (default: 60)
             - skip_existing: Skip download if file already exists (default: True)
+            - prewarm: Connect to the media hosts while preparing storage (default: False)
+            - use_thread_for_stat: Check existing files from a worker thread, for
+              network mounts where stat can block (default: False)
 
     Returns:
         Dictionary mapping tweet IDs to lists of downloaded file paths
@@ -106,12 +224,13 @@ async def download_tweet_media(
     )
 
     out_path = Path(settings.media_dir) if output_dir is None else Path(output_dir)
-    store = FileSystemMediaStore(out_path)
+    store = FileSystemMediaStore(
+        out_path, use_thread_for_stat=kwargs.pop("use_thread_for_stat", False)
+    )
 
     results = await download_media(
         media_list=media_list,
         store=store,
-        progress_desc=f"Downloading {len(media_list.media)} media files",
         **kwargs,
     )
 
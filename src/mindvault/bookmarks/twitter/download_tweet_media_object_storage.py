@@ -5,7 +5,7 @@ Generic S3-compatible media storage backend for tweet media downloads.
 from __future__ import annotations
 
 import asyncio
-from typing import AsyncIterator, Dict, List, Optional
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
 
 import aioboto3
 from botocore.config import Config
@@ -18,13 +18,28 @@ from mindvault.bookmarks.twitter.extract import (
 from mindvault.bookmarks.twitter.media_download import (
     build_media_key,
     download_media,
+    prefetch_stream,
 )
 from mindvault.core.config import BlobStorageConnection, settings
 from mindvault.core.logger_setup import logger
 
-# S3 multipart upload requires minimum 5MB per part (except last).
-MULTIPART_THRESHOLD = 5 * 1024 * 1024  # 5 MiB
-_MISSING_BUCKET_ERROR_CODES = {"404", "NoSuchBucket", "NotFound"}
+# Objects smaller than this are uploaded with a single put_object call.
+MULTIPART_THRESHOLD = 16 * 1024 * 1024  # 16 MiB
+# Size of each multipart part; S3 requires at least 5 MiB per part (except last).
+# Larger parts mean fewer requests, at the cost of memory per part in flight.
+MULTIPART_PART_SIZE = 16 * 1024 * 1024  # 16 MiB
+# Multipart parts of a single object uploaded concurrently.
+MAX_CONCURRENT_PART_UPLOADS = 4
+# HTTP connections kept by the S3 client. botocore defaults to 10, fewer than
+# the uploads and listings download_media keeps in flight.
+MAX_POOL_CONNECTIONS = 64
+# Prefix listings issued concurrently by S3CompatibleMediaStore.exists_bulk.
+_MAX_CONCURRENT_LISTINGS = 16
+_MISSING_BUCKET_ERROR_CODES = ("404", "NoSuchBucket", "NotFound")
+# (endpoint_url, bucket_name) pairs already confirmed or created by this process
+_known_buckets: Set[Tuple[str, str]] = set()
+# Cleared the first time a backend rejects conditional (If-None-Match) writes
+_conditional_puts_supported = True
 
 
 def build_s3_uri(bucket_name: str, key: str) -> str:
@@ -43,27 +58,39 @@ def _create_s3_session(connection: BlobStorageConnection) -> aioboto3.Session:
 def _create_s3_client_config(connection: BlobStorageConnection) -> Config:
     return Config(
         s3={"addressing_style": connection.addressing_style},
-        retries={"max_attempts": 5, "mode": "standard"},
+        # botocore retries a single request (one part or put) cheaply; whole
+        # items are retried again by download_media, so keep this layer short
+        retries={"max_attempts": 3, "mode": "standard"},
+        max_pool_connections=MAX_POOL_CONNECTIONS,
+        # Only compute and validate checksums for operations that require
+        # them, rather than a CRC per object and part; not every S3-compatible
+        # backend accepts the default trailing checksums either.
+        request_checksum_calculation="when_required",
+        response_checksum_validation="when_required",
     )
 
 
+def _client_error_matches(exc: ClientError, status_code: int, codes: Tuple[str, ...]) -> bool:
+    # The status code settles most cases without inspecting the error code
+    if exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode") == status_code:
+        return True
+    return str(exc.response.get("Error", {}).get("Code", "")).strip() in codes
+
+
 async def _ensure_bucket_exists(
     s3_client,
     connection: BlobStorageConnection,
 ) -> None:
     bucket_name = connection.bucket_name
+    bucket_id = (connection.endpoint_url, bucket_name)
+    if bucket_id in _known_buckets:
+        return
     try:
         await s3_client.head_bucket(Bucket=bucket_name)
+        _known_buckets.add(bucket_id)
         return
     except ClientError as exc:
-        error_code = str(exc.response.get("Error", {}).get("Code", "")).strip()
-        status_code = exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
-        is_missing_bucket = (
-            error_code in _MISSING_BUCKET_ERROR_CODES
-            or status_code == 404
-        )
-
-        if not is_missing_bucket:
+        if not _client_error_matches(exc, 404, _MISSING_BUCKET_ERROR_CODES):
             raise
 
         if not connection.auto_create_bucket:
@@ -74,6 +101,7 @@ async def _ensure_bucket_exists(
 
     logger.info(f"Creating bucket '{bucket_name}' in provider '{connection.provider}'")
     await s3_client.create_bucket(Bucket=bucket_name)
+    _known_buckets.add(bucket_id)
 
 
 async def _check_object_exists(s3_client, bucket_name: str, key: str) -> bool:
@@ -84,17 +112,46 @@ async def _check_object_exists(s3_client, bucket_name: str, key: str) -> bool:
         return False
 
 
+_CONTENT_TYPES = {
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+    "gif": "image/gif",
+    "mp4": "video/mp4",
+    "webp": "image/webp",
+}
+
+
 def _guess_content_type(key: str) -> Optional[str]:
-    ext = key.rsplit(".", 1)[-1].lower() if "." in key else ""
-    content_types = {
-        "jpg": "image/jpeg",
-        "jpeg": "image/jpeg",
-        "png": "image/png",
-        "gif": "image/gif",
-        "mp4": "video/mp4",
-        "webp": "image/webp",
-    }
-    return content_types.get(ext)
+    _, dot, ext = key.rpartition(".")
+    return _CONTENT_TYPES.get(ext.lower()) if dot else None
+
+
+async def _put_object(s3_client, *, if_absent: bool, **params) -> None:
+    """
+    Store an object with put_object, optionally only if the key is absent.
+
+    With if_absent, the If-None-Match condition lets the backend drop a
+    duplicate upload of media another worker stored in the meantime.
+    Backends without conditional writes are detected on the first rejection
+    and then written to unconditionally. Multipart uploads are not covered:
+    complete_multipart_upload is sent without the condition, since not every
+    S3-compatible backend accepts it there.
+    """
+    global _conditional_puts_supported
+    if if_absent and _conditional_puts_supported:
+        try:
+            await s3_client.put_object(IfNoneMatch="*", **params)
+            return
+        except ClientError as exc:
+            if _client_error_matches(exc, 412, ("PreconditionFailed",)):
+                logger.debug("Object already exists, skipping upload: {}", params["Key"])
+                return
+            if not _client_error_matches(exc, 501, ("NotImplemented",)):
+                raise
+            logger.info("Blob storage does not support conditional writes, disabling them")
+            _conditional_puts_supported = False
+    await s3_client.put_object(**params)
 
 
 async def _upload_stream_to_s3_compatible(
@@ -103,63 +160,117 @@ async def _upload_stream_to_s3_compatible(
     bucket_name: str,
     key: str,
     content_type: Optional[str] = None,
+    *,
+    multipart_threshold: Optional[int] = None,
+    part_size: Optional[int] = None,
+    part_concurrency: Optional[int] = None,
+    if_absent: bool = False,
 ) -> bool:
+    content_type = content_type or "application/octet-stream"
+    multipart_threshold = multipart_threshold or MULTIPART_THRESHOLD
+    part_size = part_size or MULTIPART_PART_SIZE
+    part_concurrency = part_concurrency or MAX_CONCURRENT_PART_UPLOADS
+    chunks = stream.__aiter__()
+    # Chunks are kept as received and joined once per part, rather than
+    # copied into a bytearray and shifted down after every part.
+    pending: List[bytes] = []
+    pending_size = 0
+
+    # Buffer up to the threshold first: most media is well under it and only
+    # needs one put_object call.
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= multipart_threshold:
+            break
+    else:
+        if not pending:
+            logger.error(f"Empty file received for {key}, skipping upload")
+            return False
+        await _put_object(
+            s3_client,
+            if_absent=if_absent,
+            Bucket=bucket_name,
+            Key=key,
+            Body=b"".join(pending),
+            ContentType=content_type,
+        )
+        return True
+
     multipart_upload = await s3_client.create_multipart_upload(
         Bucket=bucket_name,
         Key=key,
-        ContentType=content_type or "application/octet-stream",
+        ContentType=content_type,
     )
     upload_id = multipart_upload["UploadId"]
 
-    parts = []
-    part_number = 1
-    buffer = bytearray()
+    etags: Dict[int, str] = {}
+    uploads: List[asyncio.Task] = []
+    failures: List[BaseException] = []
+    # Parts upload in the background while the stream keeps downloading;
+    # the semaphore bounds how many are buffered and in flight at once.
+    slots = asyncio.Semaphore(part_concurrency)
 
-    try:
-        async for chunk in stream:
-            if not chunk:
-                continue
-            buffer.extend(chunk)
-
-            while len(buffer) >= MULTIPART_THRESHOLD:
-                part_data = bytes(buffer[:MULTIPART_THRESHOLD])
-                del buffer[:MULTIPART_THRESHOLD]
-
-                part_response = await s3_client.upload_part(
-                    Bucket=bucket_name,
-                    Key=key,
-                    PartNumber=part_number,
-                    UploadId=upload_id,
-                    Body=part_data,
-                )
-                parts.append({
-                    "PartNumber": part_number,
-                    "ETag": part_response["ETag"],
-                })
-                part_number += 1
-
-        if buffer:
+    async def _upload_part(part_number: int, body: bytes) -> None:
+        try:
             part_response = await s3_client.upload_part(
                 Bucket=bucket_name,
                 Key=key,
                 PartNumber=part_number,
                 UploadId=upload_id,
-                Body=bytes(buffer),
-            )
-            parts.append({
-                "PartNumber": part_number,
-                "ETag": part_response["ETag"],
-            })
-
-        if not parts:
-            await s3_client.abort_multipart_upload(
-                Bucket=bucket_name,
-                Key=key,
-                UploadId=upload_id,
+                Body=body,
             )
-            logger.error(f"Empty file received for {key}, skipping upload")
-            return False
+            etags[part_number] = part_response["ETag"]
+        except Exception as exc:
+            failures.append(exc)
+            raise
+        finally:
+            slots.release()
+
+    async def _start_part_upload(body: bytes) -> None:
+        await slots.acquire()
+        if failures:
+            slots.release()
+            raise failures[0]
+        # Part numbers are assigned in stream order, whatever order uploads finish in
+        uploads.append(asyncio.create_task(_upload_part(len(uploads) + 1, body)))
+
+    async def _start_pending_part() -> None:
+        nonlocal pending, pending_size
+        body = b"".join(pending)
+        pending, pending_size = [], 0
+        await _start_part_upload(body)
+
+    async def _add_chunk(chunk: bytes) -> None:
+        # Parts are whole chunks, so they may exceed part_size by less than
+        # one chunk; S3 only requires the minimum.
+        nonlocal pending_size
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= part_size:
+            await _start_pending_part()
 
+    try:
+        # Split the buffered chunks into parts, then continue with the stream
+        buffered, pending, pending_size = pending, [], 0
+        for chunk in buffered:
+            await _add_chunk(chunk)
+        del buffered
+        async for chunk in chunks:
+            if chunk:
+                await _add_chunk(chunk)
+
+        if pending:
+            await _start_pending_part()
+
+        await asyncio.gather(*uploads)
+
+        parts = [
+            {"PartNumber": part_number, "ETag": etags[part_number]}
+            for part_number in range(1, len(uploads) + 1)
+        ]
         await s3_client.complete_multipart_upload(
             Bucket=bucket_name,
             Key=key,
@@ -167,17 +278,11 @@ async def _upload_stream_to_s3_compatible(
             MultipartUpload={"Parts": parts},
         )
         return True
-    except asyncio.CancelledError:
-        try:
-            await s3_client.abort_multipart_upload(
-                Bucket=bucket_name,
-                Key=key,
-                UploadId=upload_id,
-            )
-        except Exception:
-            pass
-        raise
-    except Exception:
+    except BaseException:
+        # Also reached on cancellation: stop outstanding parts and drop the upload
+        for task in uploads:
+            task.cancel()
+        await asyncio.gather(*uploads, return_exceptions=True)
         try:
             await s3_client.abort_multipart_upload(
                 Bucket=bucket_name,
@@ -197,11 +302,22 @@ class S3CompatibleMediaStore:
         *,
         provider: Optional[str] = None,
         bucket_name: Optional[str] = None,
+        multipart_threshold: int = MULTIPART_THRESHOLD,
+        part_size: int = MULTIPART_PART_SIZE,
+        part_concurrency: int = MAX_CONCURRENT_PART_UPLOADS,
+        write_if_absent: bool = False,
     ) -> None:
         self.connection = settings.get_blob_storage_connection(
             provider=provider,
             bucket_name=bucket_name,
         )
+        self.multipart_threshold = multipart_threshold
+        self.part_size = part_size
+        self.part_concurrency = part_concurrency
+        # Opt-in: single-request uploads are sent with If-None-Match, leaving
+        # objects stored concurrently untouched. Multipart uploads (objects of
+        # multipart_threshold bytes or more) still complete unconditionally.
+        self.write_if_absent = write_if_absent
         self._session = _create_s3_session(self.connection)
         self._client_cm = None
         self.s3_client = None
@@ -235,6 +351,56 @@ class S3CompatibleMediaStore:
         key = build_media_key(item)
         return await _check_object_exists(self.s3_client, self.connection.bucket_name, key)
 
+    async def exists_bulk(self, items: Iterable[ExtractedMedia]) -> Optional[Set[str]]:
+        """
+        Return the locations of the given items that are already stored.
+
+        Lists each tweet's key prefix with list_objects_v2 instead of issuing
+        a head_object per item. Returns None when any listing fails, so
+        callers fall back to exists().
+        """
+        if self.s3_client is None:
+            raise RuntimeError("S3CompatibleMediaStore must be used as an async context manager")
+        bucket_name = self.connection.bucket_name
+        prefixes = {build_media_key(item).partition("/")[0] + "/" for item in items}
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        slots = asyncio.Semaphore(_MAX_CONCURRENT_LISTINGS)
+
+        async def _list_prefix(prefix: str) -> List[str]:
+            async with slots:
+                return [
+                    obj["Key"]
+                    async for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix)
+                    for obj in page.get("Contents", ())
+                    if obj.get("Size", 0) > 0
+                ]
+
+        # Any failed listing (denied, connection error, timeout) falls back to
+        # per-item checks rather than failing the whole batch
+        listed = await asyncio.gather(
+            *(_list_prefix(prefix) for prefix in prefixes), return_exceptions=True
+        )
+        for result in listed:
+            if isinstance(result, Exception):
+                logger.warning(
+                    f"Could not list bucket '{bucket_name}', checking objects one by one: {result}"
+                )
+                return None
+        return {build_s3_uri(bucket_name, key) for keys in listed for key in keys}
+
+    async def copy(self, source: ExtractedMedia, item: ExtractedMedia) -> str:
+        """Copy the stored object of source to the key of item, server-side."""
+        if self.s3_client is None:
+            raise RuntimeError("S3CompatibleMediaStore must be used as an async context manager")
+        bucket_name = self.connection.bucket_name
+        key = build_media_key(item)
+        await self.s3_client.copy_object(
+            Bucket=bucket_name,
+            Key=key,
+            CopySource={"Bucket": bucket_name, "Key": build_media_key(source)},
+        )
+        return build_s3_uri(bucket_name, key)
+
     async def save(
         self,
         item: ExtractedMedia,
@@ -246,13 +412,23 @@ class S3CompatibleMediaStore:
             raise RuntimeError("S3CompatibleMediaStore must be used as an async context manager")
         key = build_media_key(item)
         inferred_type = content_type or _guess_content_type(key)
-        success = await _upload_stream_to_s3_compatible(
-            s3_client=self.s3_client,
-            stream=stream,
-            bucket_name=self.connection.bucket_name,
-            key=key,
-            content_type=inferred_type,
-        )
+        # Keep downloading while parts are being uploaded
+        prefetched = prefetch_stream(stream)
+        try:
+            success = await _upload_stream_to_s3_compatible(
+                s3_client=self.s3_client,
+                stream=prefetched,
+                bucket_name=self.connection.bucket_name,
+                key=key,
+                content_type=inferred_type,
+                multipart_threshold=self.multipart_threshold,
+                part_size=self.part_size,
+                part_concurrency=self.part_concurrency,
+                if_absent=self.write_if_absent,
+            )
+        finally:
+            # Stop the background reader if the upload ended early
+            await prefetched.aclose()
         if not success:
             raise IOError(f"Upload failed for {key}")
         return build_s3_uri(self.connection.bucket_name, key)
@@ -263,20 +439,50 @@ async def download_tweet_media_to_blob_storage(
     *,
     provider: Optional[str] = None,
     bucket_name: Optional[str] = None,
+    multipart_threshold: int = MULTIPART_THRESHOLD,
+    part_size: int = MULTIPART_PART_SIZE,
+    part_concurrency: int = MAX_CONCURRENT_PART_UPLOADS,
+    store: Optional[S3CompatibleMediaStore] = None,
+    write_if_absent: bool = False,
     **kwargs,
 ) -> Dict[str, List[str]]:
     """
     Download tweet media and save to configured S3-compatible blob storage.
+
+    Objects under multipart_threshold bytes are stored with one put_object
+    call; larger ones are uploaded in parts of part_size bytes, with up to
+    part_concurrency parts of one object in flight at once.
+
+    With write_if_absent, objects uploaded in a single request are written
+    only if their key is still absent, so media stored by a concurrent run is
+    not uploaded twice. It is ignored when skip_existing is False, as
+    re-downloads must overwrite.
+
+    Callers uploading several batches can pass an already entered store to
+    reuse its S3 client; provider, bucket_name, the upload sizes and
+    write_if_absent are then taken from the store.
     """
-    async with S3CompatibleMediaStore(provider=provider, bucket_name=bucket_name) as store:
-        results = await download_media(
-            media_list=media_list,
-            store=store,
-            progress_desc=f"Uploading {len(media_list.media)} media files to {store.connection.provider}",
-            **kwargs,
-        )
+    if store is None:
+        async with S3CompatibleMediaStore(
+            provider=provider,
+            bucket_name=bucket_name,
+            multipart_threshold=multipart_threshold,
+            part_size=part_size,
+            part_concurrency=part_concurrency,
+            # Re-downloads requested with skip_existing=False must overwrite
+            write_if_absent=write_if_absent and kwargs.get("skip_existing", True),
+        ) as store:
+            return await download_tweet_media_to_blob_storage(
+                media_list, store=store, **kwargs
+            )
 
-    normalized_results: Dict[str, List[str]] = {}
-    for tweet_id, locations in results.items():
-        normalized_results[tweet_id] = [str(location) for location in locations]
-    return normalized_results
+    results = await download_media(
+        media_list=media_list,
+        store=store,
+        progress_desc=f"Uploading to {store.connection.provider}",
+        **kwargs,
+    )
+    return {
+        tweet_id: [str(location) for location in locations]
+        for tweet_id, locations in results.items()
+    }
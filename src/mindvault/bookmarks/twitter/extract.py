@@ -1,6 +1,10 @@
-from typing import List, Optional, Any, Dict, Literal, Tuple, Union
+from typing import Callable, List, Optional, Any, Dict, Literal, Tuple, Union, get_args, get_origin
 from pydantic import BaseModel
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 import json
+import os
+from operator import attrgetter
 from pathlib import Path
 from enum import Enum
 from mindvault.core.logger_setup import get_logger
@@ -13,6 +17,7 @@ from mindvault.bookmarks.twitter.schema import (
     Media,
     Article,
     ArticleMediaEntity,
+    ArticleEntityMapItem,
 )
 from mindvault.core.config import settings
 import uuid
@@ -23,6 +28,79 @@ import uuid
 
 logger = get_logger(__name__)
 
+# Upper bound on tweet files handed to a worker process at a time
+TWEET_FILE_CHUNK_SIZE = 16
+
+_get_expanded_url = attrgetter("expanded_url")
+_get_screen_name = attrgetter("screen_name")
+
+
+def _render_media_entity(
+    entity_item: ArticleEntityMapItem,
+    entity_map: Dict[str, str],
+    media_id_to_url: Dict[str, str],
+) -> str:
+    """Render actual media (image/video) as a markdown image."""
+    media_id = entity_map.get(entity_item.key, "")
+    media_url = media_id_to_url.get(media_id, "")
+    if media_url:
+        return f"![Media]({media_url})"
+    return "![Media](unknown)"
+
+
+def _render_markdown_entity(
+    entity_item: ArticleEntityMapItem,
+    entity_map: Dict[str, str],
+    media_id_to_url: Dict[str, str],
+) -> str:
+    """Render a code snippet/markdown block."""
+    markdown_content = entity_item.value.get("data", {}).get("markdown", "")
+    if markdown_content:
+        return f"\n{markdown_content}\n"
+    return "[CODE SNIPPET]"
+
+
+def _render_divider_entity(
+    entity_item: ArticleEntityMapItem,
+    entity_map: Dict[str, str],
+    media_id_to_url: Dict[str, str],
+) -> str:
+    """Render a horizontal divider."""
+    return "\n---\n"
+
+
+def _render_tweet_entity(
+    entity_item: ArticleEntityMapItem,
+    entity_map: Dict[str, str],
+    media_id_to_url: Dict[str, str],
+) -> str:
+    """Render an embedded tweet as a link."""
+    tweet_id = entity_item.value.get("data", {}).get("tweetId", "")
+    if tweet_id:
+        return f"[Embedded Tweet: https://x.com/i/status/{tweet_id}]"
+    return "[Embedded Tweet]"
+
+
+# Atomic article blocks by entity type: MEDIA, MARKDOWN, DIVIDER, or TWEET
+_ATOMIC_ENTITY_RENDERERS: Dict[
+    str, Callable[[ArticleEntityMapItem, Dict[str, str], Dict[str, str]], str]
+] = {
+    "MEDIA": _render_media_entity,
+    "MARKDOWN": _render_markdown_entity,
+    "DIVIDER": _render_divider_entity,
+    "TWEET": _render_tweet_entity,
+}
+
+# Markdown prefix for styled article blocks, by block type
+_BLOCK_PREFIXES: Dict[str, str] = {
+    "header-one": "# ",
+    "header-two": "## ",
+    "header-three": "### ",
+    "unordered-list-item": "• ",
+    "ordered-list-item": "- ",
+    "blockquote": "> ",
+}
+
 
 def _extract_article_content(article: Article) -> Tuple[str, List[ArticleMediaEntity]]:
     """Extract text content from a Twitter Article with inline media placeholders.
@@ -43,11 +121,14 @@ def _extract_article_content(article: Article) -> Tuple[str, List[ArticleMediaEn
             article_data.media_entities,
         )
 
-    # Build entity map lookup: key -> media_id
+    # Build entity lookups in one pass: key -> entity, and key -> media_id
+    entity_by_key: Dict[str, ArticleEntityMapItem] = {}
     entity_map: Dict[str, str] = {}
     for entity_item in content_state.entityMap:
         key = entity_item.key
         value = entity_item.value
+        # The first entity with a given key wins, as with a linear search
+        entity_by_key.setdefault(key, entity_item)
         if value.get("type") == "MEDIA":
             media_items = value.get("data", {}).get("mediaItems", [])
             if media_items:
@@ -83,66 +164,24 @@ def _extract_article_content(article: Article) -> Tuple[str, List[ArticleMediaEn
                 entity_key = str(block.entityRanges[0].get("key", ""))
 
                 # Find the entity to determine its type
-                entity_item = next(
-                    (e for e in content_state.entityMap if e.key == entity_key), None
-                )
+                entity_item = entity_by_key.get(entity_key)
 
                 if entity_item:
                     entity_type = entity_item.value.get("type", "")
-
-                    if entity_type == "MEDIA":
-                        # This is actual media (image/video)
-                        media_id = entity_map.get(entity_key, "")
-                        media_url = media_id_to_url.get(media_id, "")
-                        if media_url:
-                            text_parts.append(f"![Media]({media_url})")
-                        else:
-                            text_parts.append("![Media](unknown)")
-
-                    elif entity_type == "MARKDOWN":
-                        # This is a code snippet/markdown block
-                        markdown_content = entity_item.value.get("data", {}).get(
-                            "markdown", ""
-                        )
-                        if markdown_content:
-                            text_parts.append(f"\n{markdown_content}\n")
-                        else:
-                            text_parts.append("[CODE SNIPPET]")
-
-                    elif entity_type == "DIVIDER":
-                        # This is a horizontal divider
-                        text_parts.append("\n---\n")
-
-                    elif entity_type == "TWEET":
-                        # This is an embedded tweet
-                        tweet_id = entity_item.value.get("data", {}).get("tweetId", "")
-                        if tweet_id:
-                            text_parts.append(
-                                f"[Embedded Tweet: https://x.com/i/status/{tweet_id}]"
-                            )
-                        else:
-                            text_parts.append("[Embedded Tweet]")
-
+                    render = _ATOMIC_ENTITY_RENDERERS.get(entity_type)
+                    if render is not None:
+                        text_parts.append(render(entity_item, entity_map, media_id_to_url))
                     else:
                         # Unknown atomic type
                         text_parts.append(f"[{entity_type}]")
                 else:
                     text_parts.append("[UNKNOWN ELEMENT]")
-        elif block_type == "header-one":
-            text_parts.append(f"# {block_text}")
-        elif block_type == "header-two":
-            text_parts.append(f"## {block_text}")
-        elif block_type == "header-three":
-            text_parts.append(f"### {block_text}")
-        elif block_type == "unordered-list-item":
-            text_parts.append(f"• {block_text}")
-        elif block_type == "ordered-list-item":
-            text_parts.append(f"- {block_text}")
-        elif block_type == "blockquote":
-            text_parts.append(f"> {block_text}")
         else:
-            # Handle unstyled and other block types - just add the text
-            if block_text:
+            prefix = _BLOCK_PREFIXES.get(block_type)
+            if prefix is not None:
+                text_parts.append(prefix + block_text)
+            elif block_text:
+                # Handle unstyled and other block types - just add the text
                 text_parts.append(block_text)
 
     return "\n".join(text_parts), article_data.media_entities
@@ -293,14 +332,50 @@ def handle_media_urls_in_text(
     return text
 
 
+_SCALAR_TYPES = (str, int, type(None))
+
+
+@lru_cache(maxsize=None)
+def _scalar_fields(model: type) -> Tuple[Tuple[str, Tuple[type, ...], bool], ...]:
+    """Return (name, accepted types, required) for the str/int fields of model."""
+    fields = []
+    for name, field in model.model_fields.items():
+        annotation = field.annotation
+        types = get_args(annotation) if get_origin(annotation) is Union else (annotation,)
+        if all(t in _SCALAR_TYPES for t in types):
+            fields.append((name, types, field.is_required()))
+    return tuple(fields)
+
+
+def _construct(model: type, **values: Any) -> Any:
+    """
+    Build an extracted model without validating it field by field.
+
+    Lists and nested models come from the validated schema models, but plain
+    str/int values may not match (e.g. a None full_text), so those are
+    type-checked first. On any mismatch the values go through full
+    validation, which raises a ValidationError instead of writing them out.
+    """
+    for name, types, required in _scalar_fields(model):
+        if name in values:
+            if not isinstance(values[name], types):
+                return model(**values)
+        elif required:
+            return model(**values)
+    return model.model_construct(**values)
+
+
 # Helper function to extract the essential data from a tweet contained in an ItemContent
+# The input is already validated by the schema models, so results are built with
+# _construct rather than being validated a second time; placeholders with
+# constant values use model_construct directly.
 def extract_tweet_data(
     item_content: Union[ItemContent, ItemContentInThread],
     media_url_handling: MediaUrlHandling = MediaUrlHandling.KEEP,
 ) -> ExtractedTweet:
     # Fallback if no tweet_results or empty tweet_results (result is None)
     if item_content.tweet_results is None or item_content.tweet_results.result is None:
-        return ExtractedTweet(
+        return ExtractedTweet.model_construct(
             id="",
             text="[No tweet text available]",
             username="",
@@ -321,7 +396,7 @@ def extract_tweet_data(
 
     # If tweet marked as tombstone, return a placeholder.
     if isinstance(result, TweetTombstone):
-        return ExtractedTweet(
+        return ExtractedTweet.model_construct(
             id="",
             text="[Tweet unavailable]",
             username="",
@@ -349,7 +424,7 @@ def extract_tweet_data(
         )
     )
     if tweet_obj is None:
-        return ExtractedTweet(
+        return ExtractedTweet.model_construct(
             id="",
             text="[Unknown tweet format]",
             username="",
@@ -369,108 +444,65 @@ def extract_tweet_data(
     # Get tweet id.
     tweet_id = tweet_obj.rest_id
 
+    # Look up the nested objects once; everything below reads from these.
+    core = getattr(tweet_obj, "core", None)
+    legacy = getattr(tweet_obj, "legacy", None)
+    entities = getattr(legacy, "entities", None)
+
     # Get username (screen name) and actual name (from legacy.name) using helper methods on Core.
-    username = (
-        tweet_obj.core.get_screen_name()
-        if hasattr(tweet_obj, "core")
-        else "Unknown User"
-    )
-    actual_name = (
-        tweet_obj.core.get_user_name() if hasattr(tweet_obj, "core") else "Unknown Name"
-    )
+    username = core.get_screen_name() if core is not None else "Unknown User"
+    actual_name = core.get_user_name() if core is not None else "Unknown Name"
 
     # Variable to hold article media entities if this is an article tweet
     article_media_entities: List[ArticleMediaEntity] = []
 
     # Determine the tweet text - check for article first, then note_tweet, then legacy
-    if hasattr(tweet_obj, "article") and tweet_obj.article is not None:
+    if getattr(tweet_obj, "article", None) is not None:
         # This is an article tweet - extract article content with media placeholders
         text, article_media_entities = _extract_article_content(tweet_obj.article)
         logger.info(
             f"Extracted article tweet {tweet_id} with {len(article_media_entities)} media entities"
         )
     elif tweet_obj.note_tweet is not None:
-        text = tweet_obj.note_tweet.note_tweet_results.result.text
+        note_result = tweet_obj.note_tweet.note_tweet_results.result
+        text = note_result.text
         # Replace URLs in note tweet text if entities exist in note_tweet
-        if hasattr(tweet_obj.note_tweet.note_tweet_results.result, "entity_set"):
-            text = replace_urls_in_text(
-                text, tweet_obj.note_tweet.note_tweet_results.result.entity_set
-            )
+        if hasattr(note_result, "entity_set"):
+            text = replace_urls_in_text(text, note_result.entity_set)
     else:
-        text = (
-            tweet_obj.legacy.full_text.strip()
-            if hasattr(tweet_obj, "legacy") and tweet_obj.legacy
-            else ""
-        )
+        text = legacy.full_text.strip() if legacy else ""
         # Replace URLs in legacy tweet text
-        if (
-            hasattr(tweet_obj, "legacy")
-            and tweet_obj.legacy
-            and hasattr(tweet_obj.legacy, "entities")
-        ):
-            text = replace_urls_in_text(text, tweet_obj.legacy.entities)
+        text = replace_urls_in_text(text, entities)
 
     # Extract counts.
-    fav_count = (
-        tweet_obj.legacy.favorite_count
-        if hasattr(tweet_obj, "legacy")
-        and tweet_obj.legacy
-        and hasattr(tweet_obj.legacy, "favorite_count")
-        else 0
-    )
-    reply_count = (
-        tweet_obj.legacy.reply_count
-        if hasattr(tweet_obj, "legacy")
-        and tweet_obj.legacy
-        and hasattr(tweet_obj.legacy, "reply_count")
-        else 0
-    )
-    retweet_count = (
-        tweet_obj.legacy.retweet_count
-        if hasattr(tweet_obj, "legacy")
-        and tweet_obj.legacy
-        and hasattr(tweet_obj.legacy, "retweet_count")
-        else 0
-    )
+    fav_count = getattr(legacy, "favorite_count", 0)
+    reply_count = getattr(legacy, "reply_count", 0)
+    retweet_count = getattr(legacy, "retweet_count", 0)
 
-    # Extract URLs from tweet entities.
+    # Extract URLs, hashtags, mentions and media from tweet entities.
     urls = []
     hashtags = []
     mentions = []
     media_list = []  # List to store Media objects
-    if (
-        hasattr(tweet_obj, "legacy")
-        and tweet_obj.legacy
-        and hasattr(tweet_obj.legacy, "entities")
-        and tweet_obj.legacy.entities
-    ):
-        entities = tweet_obj.legacy.entities
-        if getattr(entities, "urls", None):
-            for url_obj in entities.urls:
-                urls.append(url_obj.expanded_url)
-        if getattr(entities, "hashtags", None):
-            for hashtag in entities.hashtags:
-                if hasattr(hashtag, "text"):
-                    hashtags.append(hashtag.text)
-        if entities.user_mentions:
-            mentions = [mention.screen_name for mention in entities.user_mentions]
-        # Extract media objects directly
-        if getattr(entities, "media", None):
-            media_list.extend(entities.media)
-
-    # Extract media URLs and video durations from tweet entities and handle them in text
     media_urls = []
     video_durations = {}
-    if (
-        hasattr(tweet_obj, "legacy")
-        and tweet_obj.legacy
-        and hasattr(tweet_obj.legacy, "entities")
-        and tweet_obj.legacy.entities
-    ):
-        entities = tweet_obj.legacy.entities
-        if getattr(entities, "media", None):
-            # First collect media URLs and video durations
-            for media in entities.media:
+    if entities:
+        url_entities = getattr(entities, "urls", None)
+        hashtag_entities = getattr(entities, "hashtags", None)
+        mention_entities = entities.user_mentions
+        media_entities = getattr(entities, "media", None)
+        if url_entities:
+            urls = list(map(_get_expanded_url, url_entities))
+        if hashtag_entities:
+            for hashtag in hashtag_entities:
+                if hasattr(hashtag, "text"):
+                    hashtags.append(hashtag.text)
+        if mention_entities:
+            mentions = list(map(_get_screen_name, mention_entities))
+        if media_entities:
+            # Collect media objects, URLs and video durations in one pass
+            for media in media_entities:
+                media_list.append(media)
                 media_urls.append(media.expanded_url)
                 # If it's a video, extract its duration
                 if media.type == "video" and hasattr(media, "video_info"):
@@ -483,13 +515,7 @@ def extract_tweet_data(
             text = handle_media_urls_in_text(text, entities, media_url_handling)
 
     # Get creation date
-    created_at = (
-        tweet_obj.legacy.created_at
-        if hasattr(tweet_obj, "legacy")
-        and tweet_obj.legacy
-        and hasattr(tweet_obj.legacy, "created_at")
-        else ""
-    )
+    created_at = getattr(legacy, "created_at", "")
 
     # Extract quoted tweet if available.
     quoted = None
@@ -499,7 +525,7 @@ def extract_tweet_data(
         # Skip if the quoted tweet is a tombstone
         if isinstance(quoted_obj, TweetTombstone):
             # Create a basic quoted tweet with minimal information
-            quoted = ExtractedQuote(
+            quoted = ExtractedQuote.model_construct(
                 id="",
                 text="[Quoted tweet unavailable]",
                 username="",
@@ -510,80 +536,54 @@ def extract_tweet_data(
             if hasattr(quoted_obj, "tweet"):
                 quoted_obj = quoted_obj.tweet
 
+            q_core = getattr(quoted_obj, "core", None)
+            q_legacy = getattr(quoted_obj, "legacy", None)
+            q_entities = getattr(q_legacy, "entities", None)
+            q_note_tweet = getattr(quoted_obj, "note_tweet", None)
+
             # Extract quoted tweet ID
-            quoted_id = quoted_obj.rest_id if hasattr(quoted_obj, "rest_id") else ""
+            quoted_id = getattr(quoted_obj, "rest_id", "")
 
             # Check for note_tweet in quoted tweet
-            if hasattr(quoted_obj, "note_tweet") and quoted_obj.note_tweet is not None:
-                quoted_text = quoted_obj.note_tweet.note_tweet_results.result.text
+            if q_note_tweet is not None:
+                q_note_result = q_note_tweet.note_tweet_results.result
+                quoted_text = q_note_result.text
                 # Replace URLs in quoted note tweet text
-                if hasattr(
-                    quoted_obj.note_tweet.note_tweet_results.result, "entity_set"
-                ):
+                if hasattr(q_note_result, "entity_set"):
                     quoted_text = replace_urls_in_text(
-                        quoted_text,
-                        quoted_obj.note_tweet.note_tweet_results.result.entity_set,
+                        quoted_text, q_note_result.entity_set
                     )
             else:
-                quoted_text = (
-                    quoted_obj.legacy.full_text.strip()
-                    if hasattr(quoted_obj, "legacy") and quoted_obj.legacy
-                    else ""
-                )
+                quoted_text = q_legacy.full_text.strip() if q_legacy else ""
                 # Replace URLs in quoted legacy tweet text
-                if (
-                    hasattr(quoted_obj, "legacy")
-                    and quoted_obj.legacy
-                    and hasattr(quoted_obj.legacy, "entities")
-                ):
-                    quoted_text = replace_urls_in_text(
-                        quoted_text, quoted_obj.legacy.entities
-                    )
+                quoted_text = replace_urls_in_text(quoted_text, q_entities)
 
             quoted_username = (
-                quoted_obj.core.get_screen_name()
-                if hasattr(quoted_obj, "core")
-                else "Unknown User"
+                q_core.get_screen_name() if q_core is not None else "Unknown User"
             )
             quoted_actual_name = (
-                quoted_obj.core.get_user_name()
-                if hasattr(quoted_obj, "core")
-                else "Unknown Name"
-            )
-            quoted_created_at = (
-                quoted_obj.legacy.created_at
-                if hasattr(quoted_obj, "legacy")
-                and quoted_obj.legacy
-                and hasattr(quoted_obj.legacy, "created_at")
-                else ""
-            )
-            quoted_link = (
-                tweet_obj.legacy.quoted_status_permalink.expanded
-                if hasattr(tweet_obj, "legacy")
-                and tweet_obj.legacy
-                and hasattr(tweet_obj.legacy, "quoted_status_permalink")
-                and tweet_obj.legacy.quoted_status_permalink
-                else None
+                q_core.get_user_name() if q_core is not None else "Unknown Name"
             )
+            quoted_created_at = getattr(q_legacy, "created_at", "")
+            permalink = getattr(legacy, "quoted_status_permalink", None)
+            quoted_link = permalink.expanded if permalink else None
             quoted_urls = []
             quoted_media_urls = []
             quoted_video_durations = {}
             quoted_hashtags = []
             quoted_mentions = []
             quoted_media_list = []  # List to store Media objects for quoted tweet
-            if (
-                hasattr(quoted_obj, "legacy")
-                and quoted_obj.legacy
-                and quoted_obj.legacy.entities
-            ):
-                q_entities = quoted_obj.legacy.entities
-                if getattr(q_entities, "urls", None):
-                    for url_obj in q_entities.urls:
-                        quoted_urls.append(url_obj.expanded_url)
-                if getattr(q_entities, "media", None):
-                    # Extract media objects directly
-                    quoted_media_list.extend(q_entities.media)
-                    for media in q_entities.media:
+            if q_entities:
+                q_url_entities = getattr(q_entities, "urls", None)
+                q_media_entities = getattr(q_entities, "media", None)
+                q_hashtag_entities = getattr(q_entities, "hashtags", None)
+                q_mention_entities = getattr(q_entities, "user_mentions", None)
+                if q_url_entities:
+                    quoted_urls = list(map(_get_expanded_url, q_url_entities))
+                if q_media_entities:
+                    # Collect media objects, URLs and video durations in one pass
+                    for media in q_media_entities:
+                        quoted_media_list.append(media)
                         quoted_media_urls.append(media.expanded_url)
                         # If it's a video, extract its duration
                         if media.type == "video" and hasattr(media, "video_info"):
@@ -596,23 +596,17 @@ def extract_tweet_data(
                     quoted_text = handle_media_urls_in_text(
                         quoted_text, q_entities, media_url_handling
                     )
-                if getattr(q_entities, "hashtags", None):
-                    for hashtag in q_entities.hashtags:
+                if q_hashtag_entities:
+                    for hashtag in q_hashtag_entities:
                         if hasattr(hashtag, "text"):
                             quoted_hashtags.append(hashtag.text)
-                if getattr(q_entities, "user_mentions", None):
-                    for mention in q_entities.user_mentions:
+                if q_mention_entities:
+                    for mention in q_mention_entities:
                         if hasattr(mention, "screen_name"):
                             quoted_mentions.append(mention.screen_name)
-            quoted_created_at = (
-                quoted_obj.legacy.created_at
-                if hasattr(quoted_obj, "legacy")
-                and quoted_obj.legacy
-                and hasattr(quoted_obj.legacy, "created_at")
-                else ""
-            )
             # We combine the URLs from the text field and media.
-            quoted = ExtractedQuote(
+            quoted = _construct(
+                ExtractedQuote,
                 id=quoted_id,
                 text=quoted_text,
                 username=quoted_username,
@@ -632,7 +626,8 @@ def extract_tweet_data(
     if tweet_obj and hasattr(tweet_obj, "card"):
         card = _extract_card_data(tweet_obj)
 
-    return ExtractedTweet(
+    return _construct(
+        ExtractedTweet,
         id=tweet_id,
         text=text,
         username=username,
@@ -743,7 +738,7 @@ def _extract_card_data(tweet_obj: Any) -> Optional[ExtractedCard]:
 
     # Only return card data if we have at least one content field or image
     if any(v for k, v in card_data.items() if k != "images") or card_data["images"]:
-        return ExtractedCard(**card_data)
+        return _construct(ExtractedCard, **card_data)
     return None
 
 
@@ -775,10 +770,8 @@ def process_single_tweet_file(
         # Extract tweet ID from filename
         tweet_id = json_file.stem
 
-        # Load and process tweet data
-        with open(json_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        tweet_data = TweetData.model_validate(data)
+        # Parse and validate tweet data in a single pass
+        tweet_data = TweetData.model_validate_json(json_file.read_bytes())
         extracted_conv = _extract_conversation(
             tweet_data.threaded_conversation_with_injections_v2, media_url_handling
         )
@@ -787,8 +780,9 @@ def process_single_tweet_file(
         if save_to_file:
             output_dir.mkdir(parents=True, exist_ok=True)
             output_file = output_dir / f"{tweet_id}_extracted.json"
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(extracted_conv.model_dump(), f, indent=2)
+            output_file.write_text(
+                extracted_conv.model_dump_json(indent=2), encoding="utf-8"
+            )
             logger.info(f"Saved extracted data for tweet {tweet_id}")
 
         return extracted_conv
@@ -798,28 +792,15 @@ def process_single_tweet_file(
         return None
 
 
-def process_all_tweet_files(
-    tweet_data_dir: Path,
-    output_dir: Path,
-    media_url_handling: MediaUrlHandling = MediaUrlHandling.KEEP,
-) -> None:
-    """Process all tweet JSON files in the specified directory and extract conversations.
-
-    Args:
-        tweet_data_dir: Directory containing tweet JSON files
-        output_dir: Directory to save extracted conversations
-        media_url_handling: How to handle media URLs in tweet text (keep/replace/remove)
-    """
+def _find_unprocessed_tweet_files(tweet_data_dir: Path, output_dir: Path) -> List[Path]:
+    """Return the tweet JSON files that have no valid extracted output yet."""
     # Get all JSON files in the tweet_data directory
     json_files = list(tweet_data_dir.glob("*.json"))
     logger.info(f"Found {len(json_files)} tweet files to process")
 
-    processed = 0
-    failed = 0
-    failed_tweets = []
-
+    unprocessed = []
     for json_file in json_files:
-        # Skip if already processed
+        # Skip if already processed - use EAFP
         tweet_id = json_file.stem
         output_file = output_dir / f"{tweet_id}_extracted.json"
 
@@ -832,15 +813,72 @@ def process_all_tweet_files(
         except (FileNotFoundError, json.JSONDecodeError):
             # File doesn't exist or is corrupted, proceed with processing
             pass
+        unprocessed.append(json_file)
+    return unprocessed
 
-        # Process the file
-        result = process_single_tweet_file(
-            json_file,
-            output_dir,
-            save_to_file=True,
+
+def _map_tweet_files(
+    process_file: Callable[[Path], bool], json_files: List[Path], max_workers: int
+) -> List[bool]:
+    """Apply process_file to each file, in worker processes when max_workers > 1.
+
+    Parsing and validating tweet files is CPU bound, so a process pool is used
+    rather than threads. Workers only send back a success flag to keep the
+    pickling cost between processes low.
+    """
+    if max_workers <= 1 or len(json_files) <= 1:
+        return [process_file(json_file) for json_file in json_files]
+
+    # Keep several chunks per worker so a slow file doesn't idle the others
+    chunksize = max(1, min(TWEET_FILE_CHUNK_SIZE, len(json_files) // (max_workers * 4)))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(process_file, json_files, chunksize=chunksize))
+
+
+def _save_tweet_file(
+    json_file: Path, output_dir: Path, media_url_handling: MediaUrlHandling
+) -> bool:
+    result = process_single_tweet_file(
+        json_file,
+        output_dir,
+        save_to_file=True,
+        media_url_handling=media_url_handling,
+    )
+    return result is not None
+
+
+def process_all_tweet_files(
+    tweet_data_dir: Path,
+    output_dir: Path,
+    media_url_handling: MediaUrlHandling = MediaUrlHandling.KEEP,
+    max_workers: int = 1,
+) -> None:
+    """Process all tweet JSON files in the specified directory and extract conversations.
+
+    Args:
+        tweet_data_dir: Directory containing tweet JSON files
+        output_dir: Directory to save extracted conversations
+        media_url_handling: How to handle media URLs in tweet text (keep/replace/remove)
+        max_workers: Number of worker processes; 1 processes files in this process
+    """
+    json_files = _find_unprocessed_tweet_files(tweet_data_dir, output_dir)
+    results = _map_tweet_files(
+        partial(
+            _save_tweet_file,
+            output_dir=output_dir,
             media_url_handling=media_url_handling,
-        )
-        if result is not None:
+        ),
+        json_files,
+        max_workers,
+    )
+
+    processed = 0
+    failed = 0
+    failed_tweets = []
+
+    for json_file, succeeded in zip(json_files, results):
+        tweet_id = json_file.stem
+        if succeeded:
             processed += 1
         else:
             failed += 1
@@ -1219,8 +1257,9 @@ def process_single_tweet_file_with_media(
             tweet_id = json_file.stem
             output_dir.mkdir(parents=True, exist_ok=True)
             output_file = output_dir / f"{tweet_id}_extracted.json"
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(conversation_with_media.model_dump(), f, indent=2)
+            output_file.write_text(
+                conversation_with_media.model_dump_json(indent=2), encoding="utf-8"
+            )
             logger.info(f"Saved extracted data with media for tweet {tweet_id}")
 
         return conversation_with_media
@@ -1230,6 +1269,13 @@ def process_single_tweet_file_with_media(
         return None
 
 
+def _save_tweet_file_with_media(json_file: Path, output_dir: Path, **kwargs) -> bool:
+    result = process_single_tweet_file_with_media(
+        json_file, output_dir, save_to_file=True, **kwargs
+    )
+    return result is not None
+
+
 def process_all_tweet_files_with_media(
     tweet_data_dir: Path,
     output_dir: Path,
@@ -1239,6 +1285,7 @@ def process_all_tweet_files_with_media(
     extract_images: bool = True,
     extract_card_images: bool = True,
     video_length_limit: Optional[int] = None,
+    max_workers: int = 1,
 ) -> None:
     """Process all tweet JSON files in the specified directory and extract conversations with media.
 
@@ -1251,43 +1298,31 @@ def process_all_tweet_files_with_media(
         extract_images: Whether to extract images
         extract_card_images: Whether to extract images from Twitter cards
         video_length_limit: Optional video length limit in seconds
+        max_workers: Number of worker processes; 1 processes files in this process
     """
-    # Get all JSON files in the tweet_data directory
-    json_files = list(tweet_data_dir.glob("*.json"))
-    logger.info(f"Found {len(json_files)} tweet files to process")
-
-    processed = 0
-    failed = 0
-    failed_tweets = []
-
-    for json_file in json_files:
-        # Skip if already processed - use EAFP
-        tweet_id = json_file.stem
-        output_file = output_dir / f"{tweet_id}_extracted.json"
-
-        try:
-            # Try to read existing file to check if processing is complete
-            with open(output_file, "r") as f:
-                json.load(f)  # If this succeeds, file exists and is valid JSON
-            logger.info(f"Skipping {tweet_id} - already processed")
-            continue
-        except (FileNotFoundError, json.JSONDecodeError):
-            # File doesn't exist or is corrupted, proceed with processing
-            pass
-
-        # Process the file with media
-        result = process_single_tweet_file_with_media(
-            json_file,
-            output_dir,
-            save_to_file=True,
+    json_files = _find_unprocessed_tweet_files(tweet_data_dir, output_dir)
+    results = _map_tweet_files(
+        partial(
+            _save_tweet_file_with_media,
+            output_dir=output_dir,
             media_url_handling=media_url_handling,
             extract_video_thumbnail=extract_video_thumbnail,
             extract_videos=extract_videos,
             extract_images=extract_images,
             extract_card_images=extract_card_images,
             video_length_limit=video_length_limit,
-        )
-        if result is not None:
+        ),
+        json_files,
+        max_workers,
+    )
+
+    processed = 0
+    failed = 0
+    failed_tweets = []
+
+    for json_file, succeeded in zip(json_files, results):
+        tweet_id = json_file.stem
+        if succeeded:
             processed += 1
         else:
             failed += 1
@@ -1366,4 +1401,5 @@ if __name__ == "__main__":
         settings.extracted_data_dir,
         media_url_handling=MediaUrlHandling.REMOVE,
         video_length_limit=None,
+        max_workers=os.cpu_count() or 1,
     )
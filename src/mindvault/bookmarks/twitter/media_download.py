@@ -6,20 +6,40 @@ from __future__ import annotations
 
 import asyncio
 import random
+from collections import defaultdict
+import weakref
+from functools import lru_cache
 from pathlib import Path
 from typing import AsyncIterator, Dict, List, Optional, Protocol, Tuple, Union
-from urllib.parse import urlsplit
 
-from httpx import AsyncClient, Limits
-from tqdm.asyncio import tqdm_asyncio
+from httpx import AsyncClient, HTTPStatusError, Limits, Response, TransportError
+from tqdm import tqdm
 
 from mindvault.bookmarks.twitter.extract import ExtractedMedia, ExtractedMediaList
 from mindvault.core.logger_setup import logger
 
 MediaLocation = Union[str, Path]
 
+# Connection pool defaults. Media comes from a handful of CDN hosts that speak
+# HTTP/2, where one connection per host multiplexes every download, so few
+# sockets are opened in practice. The limit still matches the downloads in
+# flight: over HTTP/1.1 each download needs its own connection, and time spent
+# waiting for one counts against the request timeout.
+DEFAULT_MAX_CONNECTIONS = 50
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+# Downloads in flight at once, multiplexed as HTTP/2 streams over the pool;
+# never more than max_connections unless set explicitly
+DEFAULT_MAX_CONCURRENT_DOWNLOADS = 50
+# Bytes per streamed chunk; large chunks mean fewer event loop steps per MiB
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB
+# Upper bound in seconds for the delay between download retries
+MAX_RETRY_DELAY = 30.0
+# Client error statuses that may succeed on a later attempt
+_RETRYABLE_CLIENT_ERRORS = frozenset({408, 429})
+
 # User agents to randomize requests
-USER_AGENTS = [
+USER_AGENTS = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -31,11 +51,21 @@ USER_AGENTS = [
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.1 Safari/605.1.15",
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:90.0) Gecko/20100101 Firefox/90.0",
-]
+)
 
 
 class MediaStore(Protocol):
-    """Storage backend interface for downloaded media."""
+    """
+    Storage backend interface for downloaded media.
+
+    Stores may also provide ``async exists_bulk(items)`` returning the set of
+    locations already stored (or None if unavailable); download_media then
+    uses it instead of calling exists() per item.
+
+    Stores that provide ``async copy(source, item)``, copying the stored
+    object of source to the location of item, get media shared by several
+    tweets downloaded once and copied to the other tweets' locations.
+    """
 
     async def prepare(self) -> None:
         """Prepare backend resources (e.g. create directories or buckets)."""
@@ -57,9 +87,9 @@ class MediaStore(Protocol):
 
 
 async def _create_http_client(
-    max_connections: int = 50,
-    max_keepalive_connections: Optional[int] = None,
-    keepalive_expiry: float = 5.0,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: Optional[int] = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
     timeout: int = 60,
     user_agent: Optional[str] = None,
 ) -> AsyncClient:
@@ -68,6 +98,7 @@ async def _create_http_client(
     """
     if max_keepalive_connections is None:
         max_keepalive_connections = max_connections
+    max_keepalive_connections = min(max_keepalive_connections, max_connections)
 
     limits = Limits(
         max_connections=max_connections,
@@ -75,7 +106,12 @@ async def _create_http_client(
         keepalive_expiry=keepalive_expiry,
     )
 
-    headers = {"user-agent": user_agent or random.choice(USER_AGENTS)}
+    headers = {
+        "user-agent": user_agent or random.choice(USER_AGENTS),
+        # Media is already compressed, and bodies are stored as read from the
+        # wire (aiter_raw), so ask servers not to re-encode them
+        "accept-encoding": "identity",
+    }
 
     return AsyncClient(
         limits=limits,
@@ -87,33 +123,251 @@ async def _create_http_client(
     )
 
 
+# One pooled client per event loop, with the settings it was created with and
+# the task that closes it when the loop shuts down
+_shared_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[AsyncClient, Dict, asyncio.Task]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def _close_on_shutdown(client: AsyncClient) -> None:
+    """
+    Wait until cancelled, then close the client.
+
+    asyncio.run() cancels the tasks still pending when its coroutine
+    returns, so the shared client is closed along with its event loop
+    whichever entry point created it.
+    """
+    try:
+        await asyncio.get_running_loop().create_future()
+    finally:
+        try:
+            await client.aclose()
+        except Exception as exc:
+            logger.debug(f"Error closing shared HTTP client: {exc}")
+
+
+async def _get_shared_client(**client_kwargs) -> AsyncClient:
+    """
+    Get the HTTP client shared by all downloads on the running event loop.
+
+    Reusing the client keeps its connection pool, TLS sessions and HTTP/2
+    connections alive across download_media calls. Pool settings are fixed
+    by the first caller; later callers asking for different ones get a warning.
+    """
+    loop = asyncio.get_running_loop()
+    entry = _shared_clients.get(loop)
+    if entry is not None:
+        client, created_with, closer = entry
+        if not client.is_closed:
+            if client_kwargs != created_with:
+                logger.warning(
+                    f"Reusing shared HTTP client created with {created_with}; ignoring {client_kwargs}"
+                )
+            return client
+        closer.cancel()
+
+    client = await _create_http_client(**client_kwargs)
+    _shared_clients[loop] = (client, client_kwargs, loop.create_task(_close_on_shutdown(client)))
+    return client
+
+
+async def close_shared_http_client() -> None:
+    """
+    Close the shared HTTP client of the running event loop, if any.
+
+    The client is closed automatically when asyncio.run() finishes; call this
+    to close it earlier, or on loops that are not run by asyncio.run().
+    """
+    entry = _shared_clients.pop(asyncio.get_running_loop(), None)
+    if entry is not None:
+        closer = entry[2]
+        closer.cancel()
+        await asyncio.gather(closer, return_exceptions=True)
+
+
+async def _prewarm_connections(client: AsyncClient, urls: List[str]) -> None:
+    """
+    Open a pooled connection to each media host ahead of the downloads.
+
+    One HEAD request per host is enough: with HTTP/2 the downloads are
+    multiplexed over that connection. Failures are ignored, the downloads
+    will simply connect on their own.
+    """
+    origins = {f"{scheme}://{host}/" for scheme, host in (_split_origin(url) for url in urls) if host}
+    results = await asyncio.gather(
+        *(client.head(origin) for origin in origins),
+        return_exceptions=True,
+    )
+    failures = [result for result in results if isinstance(result, Exception)]
+    if failures:
+        logger.debug(f"Could not prewarm {len(failures)}/{len(origins)} media hosts: {failures[0]}")
+
+
+def _split_origin(url: str) -> Tuple[str, str]:
+    scheme, _, rest = url.partition("://")
+    return scheme, rest.partition("/")[0]
+
+
 def build_media_key(item: ExtractedMedia) -> str:
     """
     Build a storage key/path for a media item.
 
     Format: {tweet_id}/{media_id}.{ext}
     """
-    url = item.media_url
-    ext = urlsplit(url).path.split("/")[-1].split("?")[0]
-    filename = f"{item.media_id}"
+    return _build_media_key(item.tweet_id, item.media_id, item.media_url)
+
+
+@lru_cache(maxsize=4096)
+def _build_media_key(tweet_id: str, media_id: str, url: str) -> str:
+    # Cached: the key is needed by every exists/get_location/save call and retry
+    ext = url.partition("?")[0].partition("#")[0].rpartition("/")[2]
+    filename = f"{media_id}"
     if "." not in filename and "." in ext:
-        filename = f"{filename}.{ext.split('.')[-1]}"
-    return f"{item.tweet_id}/{filename}"
+        filename = f"{filename}.{ext.rpartition('.')[2]}"
+    return f"{tweet_id}/{filename}"
+
+
+def _response_validator(response: Response) -> Optional[str]:
+    """Return the ETag or Last-Modified value usable with If-Range, if any."""
+    etag = response.headers.get("etag")
+    if etag and etag.startswith("W/"):
+        etag = None  # weak ETags can't be used with If-Range
+    return etag or response.headers.get("last-modified")
 
 
 async def download_media_stream(
     client: AsyncClient,
     url: str,
-    chunk_size: int = 32768,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_resumes: int = 3,
 ) -> AsyncIterator[bytes]:
     """
     Stream media from a URL without buffering the entire response in memory.
+
+    If the connection drops mid-body, the download resumes from the last
+    received byte with a Range request (up to max_resumes times) instead of
+    failing the whole transfer. A server that ignores the range (200) or
+    rejects it (416) is asked for the whole file again, and the bytes already
+    yielded are skipped, as long as its ETag or Last-Modified shows the file
+    is unchanged. Otherwise an IOError is raised, and the caller's retry
+    starts the download over from the first byte. If the connection drops
+    again after max_resumes resumes, the TransportError is re-raised.
+    """
+    received = 0
+    resumes = 0
+    validator = None
+    use_range = True
+    while True:
+        headers = None
+        if received and use_range:
+            headers = {"Range": f"bytes={received}-"}
+            if validator:
+                # Only accept the partial response if the file hasn't changed
+                headers["If-Range"] = validator
+        try:
+            async with client.stream("GET", url, headers=headers) as response:
+                skip = 0
+                if received:
+                    if response.status_code == 416 and use_range:
+                        # Range rejected: request the whole file instead
+                        use_range = False
+                        continue
+                    if response.is_error:
+                        raise IOError(
+                            f"Server rejected resuming {url} (HTTP {response.status_code})"
+                        )
+                    content_range = response.headers.get("content-range", "")
+                    if response.status_code == 206 and content_range.startswith(f"bytes {received}-"):
+                        pass
+                    elif (
+                        response.status_code == 200
+                        and validator
+                        and _response_validator(response) == validator
+                    ):
+                        # Same file sent in full: drop the bytes already yielded
+                        skip = received
+                    else:
+                        raise IOError(f"Server did not resume {url} from byte {received}")
+                else:
+                    response.raise_for_status()
+                    validator = _response_validator(response)
+                async for chunk in response.aiter_raw(chunk_size):
+                    if skip:
+                        if len(chunk) <= skip:
+                            skip -= len(chunk)
+                            continue
+                        chunk = chunk[skip:]
+                        skip = 0
+                    if chunk:
+                        received += len(chunk)
+                        yield chunk
+                return
+        except TransportError as exc:
+            if not received or resumes >= max_resumes:
+                raise
+            resumes += 1
+            logger.warning(
+                f"Connection lost downloading {url} after {received} bytes, "
+                f"resuming (attempt {resumes}/{max_resumes}): {exc}"
+            )
+
+
+async def prefetch_stream(
+    stream: AsyncIterator[bytes],
+    max_chunks: int = 8,
+) -> AsyncIterator[bytes]:
+    """
+    Read a stream ahead of its consumer in a background task.
+
+    Up to max_chunks chunks are queued, so the download keeps going while
+    the consumer is busy (e.g. waiting on an upload) instead of the two
+    alternating. Errors raised by the stream are re-raised to the consumer.
     """
-    async with client.stream("GET", url) as response:
-        response.raise_for_status()
-        async for chunk in response.aiter_raw(chunk_size):
-            if chunk:
-                yield chunk
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_chunks)
+    end_of_stream = object()
+
+    async def _produce() -> None:
+        try:
+            async for chunk in stream:
+                await queue.put(chunk)
+            await queue.put(end_of_stream)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            await queue.put(exc)
+        finally:
+            aclose = getattr(stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    producer = asyncio.create_task(_produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is end_of_stream:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """Return False for HTTP client errors that another attempt will not fix."""
+    if isinstance(exc, HTTPStatusError):
+        status_code = exc.response.status_code
+        return status_code >= 500 or status_code in _RETRYABLE_CLIENT_ERRORS
+    return True
+
+
+def _retry_delay(retry_delay: float, retry_count: int) -> float:
+    # Exponential backoff with jitter, so concurrent downloads throttled at
+    # the same moment do not all retry together
+    delay = min(retry_delay * (2 ** (retry_count - 1)), MAX_RETRY_DELAY)
+    return delay * (0.5 + random.random())
 
 
 async def download_media(
@@ -128,69 +382,149 @@ async def download_media(
         logger.warning("No media items to download")
         return {}
 
-    chunk_size = kwargs.get("chunk_size", 32768)
+    chunk_size = kwargs.get("chunk_size", DEFAULT_CHUNK_SIZE)
     max_retries = kwargs.get("max_retries", 3)
     retry_delay = kwargs.get("retry_delay", 1.0)
     skip_existing = kwargs.get("skip_existing", True)
-    progress_desc = kwargs.get(
-        "progress_desc",
-        f"Downloading {len(media_list.media)} media files",
-    )
-
-    await store.prepare()
 
-    async with await _create_http_client(
-        max_connections=kwargs.get("max_connections", 50),
-        max_keepalive_connections=kwargs.get("max_keepalive_connections"),
-        keepalive_expiry=kwargs.get("keepalive_expiry", 5.0),
+    # The same media can be extracted more than once for a tweet; items that
+    # map to the same stored object are downloaded once
+    unique_media: Dict[str, ExtractedMedia] = {}
+    for item in media_list.media:
+        unique_media.setdefault(build_media_key(item), item)
+    media = list(unique_media.values())
+
+    # Media shared by several tweets (retweets, quotes) is downloaded once per
+    # URL and copied to the other tweets' keys, where the store can copy
+    groups: Dict[Union[str, int], List[Tuple[int, ExtractedMedia]]] = defaultdict(list)
+    can_copy = hasattr(store, "copy")
+    for index, item in enumerate(media):
+        groups[item.media_url if can_copy else index].append((index, item))
+
+    # A caller's description is free-form text; the number of unique items is
+    # appended to it rather than formatted into it
+    if "progress_desc" in kwargs:
+        progress_desc = f"{kwargs['progress_desc']} ({len(media)} files)"
+    else:
+        progress_desc = f"Downloading {len(media)} media files"
+
+    max_connections = kwargs.get("max_connections", DEFAULT_MAX_CONNECTIONS)
+    client = await _get_shared_client(
+        max_connections=max_connections,
+        max_keepalive_connections=kwargs.get(
+            "max_keepalive_connections", DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+        ),
+        keepalive_expiry=kwargs.get("keepalive_expiry", DEFAULT_KEEPALIVE_EXPIRY),
         timeout=kwargs.get("timeout", 60),
-    ) as client:
-        async def _download_single(item: ExtractedMedia) -> Tuple[str, Optional[MediaLocation]]:
-            if skip_existing and await store.exists(item):
-                location = store.get_location(item)
-                logger.debug(f"Media already exists, skipping: {location}")
-                return (item.tweet_id, location)
-
-            retry_count = 0
-            while retry_count <= max_retries:
-                try:
-                    stream = download_media_stream(
-                        client=client,
-                        url=item.media_url,
-                        chunk_size=chunk_size,
-                    )
-                    saved_location = await store.save(
-                        item=item,
-                        stream=stream,
-                        content_type=None,
-                    )
-                    return (item.tweet_id, saved_location)
-                except asyncio.CancelledError:
-                    raise
-                except Exception as e:
-                    retry_count += 1
-                    if retry_count > max_retries:
-                        logger.error(
-                            f"Failed to download {item.media_url} after {max_retries} retries: {e}"
-                        )
-                        return (item.tweet_id, None)
-                    logger.warning(
-                        f"Error downloading {item.media_url} (attempt {retry_count}/{max_retries}): {e}"
-                    )
-                    await asyncio.sleep(retry_delay * retry_count)
-
-            return (item.tweet_id, None)
+    )
 
-        results = await tqdm_asyncio.gather(
-            *(_download_single(item) for item in media_list.media),
-            desc=progress_desc,
+    if kwargs.get("prewarm", False):
+        # TLS handshakes to the media hosts overlap with preparing the store
+        await asyncio.gather(
+            store.prepare(),
+            _prewarm_connections(client, [item.media_url for item in media]),
         )
+    else:
+        await store.prepare()
+    # More workers than connections would only queue for the pool on HTTP/1.1
+    max_concurrent_downloads = kwargs.get(
+        "max_concurrent_downloads",
+        min(DEFAULT_MAX_CONCURRENT_DOWNLOADS, max_connections),
+    )
 
-    download_results: Dict[str, List[MediaLocation]] = {}
+    # Stores that can check many items at once (e.g. by listing a bucket)
+    # expose exists_bulk; otherwise each item is checked individually
+    existing_locations = None
+    if skip_existing and hasattr(store, "exists_bulk"):
+        existing_locations = await store.exists_bulk(media)
+
+    async def _is_stored(item: ExtractedMedia) -> bool:
+        if existing_locations is not None:
+            return store.get_location(item) in existing_locations
+        return await store.exists(item)
+
+    async def _download_single(item: ExtractedMedia) -> Tuple[str, Optional[MediaLocation]]:
+        if skip_existing and await _is_stored(item):
+            location = store.get_location(item)
+            logger.debug("Media already exists, skipping: {}", location)
+            return (item.tweet_id, location)
+
+        retry_count = 0
+        while retry_count <= max_retries:
+            try:
+                stream = download_media_stream(
+                    client=client,
+                    url=item.media_url,
+                    chunk_size=chunk_size,
+                )
+                saved_location = await store.save(
+                    item=item,
+                    stream=stream,
+                    content_type=None,
+                )
+                return (item.tweet_id, saved_location)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not _is_retryable(e):
+                    logger.error(f"Failed to download {item.media_url}: {e}")
+                    return (item.tweet_id, None)
+                retry_count += 1
+                if retry_count > max_retries:
+                    logger.error(
+                        f"Failed to download {item.media_url} after {max_retries} retries: {e}"
+                    )
+                    return (item.tweet_id, None)
+                logger.warning(
+                    f"Error downloading {item.media_url} (attempt {retry_count}/{max_retries}): {e}"
+                )
+                await asyncio.sleep(_retry_delay(retry_delay, retry_count))
+
+        return (item.tweet_id, None)
+
+    async def _copy_single(
+        source: ExtractedMedia, item: ExtractedMedia
+    ) -> Tuple[str, Optional[MediaLocation]]:
+        if skip_existing and await _is_stored(item):
+            location = store.get_location(item)
+            logger.debug("Media already exists, skipping: {}", location)
+            return (item.tweet_id, location)
+        return (item.tweet_id, await store.copy(source, item))
+
+    # A fixed pool of workers pulls URLs from a shared iterator, so only
+    # max_concurrent_downloads tasks exist at a time however long the list is
+    results: List[Tuple[str, Optional[MediaLocation]]] = [None] * len(media)
+    pending_groups = iter(groups.values())
+
+    with tqdm(total=len(media), desc=progress_desc) as progress:
+        async def _store_item(index: int, item: ExtractedMedia, operation) -> None:
+            try:
+                results[index] = await operation
+            except Exception as e:
+                # A failing store call fails only its own item; letting it
+                # escape would cancel every other worker in the group
+                logger.error(f"Failed to download {item.media_url}: {e}")
+                results[index] = (item.tweet_id, None)
+            progress.update(1)
+
+        async def _worker() -> None:
+            for (index, source), *copies in pending_groups:
+                await _store_item(index, source, _download_single(source))
+                stored = results[index][1] is not None
+                for index, item in copies:
+                    if stored:
+                        await _store_item(index, item, _copy_single(source, item))
+                    else:
+                        results[index] = (item.tweet_id, None)
+                        progress.update(1)
+
+        async with asyncio.TaskGroup() as workers:
+            for _ in range(min(max_concurrent_downloads, len(groups))):
+                workers.create_task(_worker())
+
+    download_results: Dict[str, List[MediaLocation]] = defaultdict(list)
     for tweet_id, location in results:
         if location:
-            if tweet_id not in download_results:
-                download_results[tweet_id] = []
             download_results[tweet_id].append(location)
 
-    return download_results
+    return dict(download_results)
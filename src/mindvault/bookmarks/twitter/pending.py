@@ -7,7 +7,7 @@ import json
 from pathlib import Path
 from typing import Set
 
-from mindvault.bookmarks.twitter.database import get_existing_tweet_ids
+from mindvault.bookmarks.twitter.database import filter_new_tweet_ids, get_total_tweets
 from mindvault.core.config import settings
 from mindvault.core.logger_setup import get_logger
 
@@ -58,9 +58,8 @@ class PendingTweetsFinder:
         """
         logger.info("Finding pending tweets")
         source_ids = self.load_source_tweet_ids()
-        logger.info("Getting processed tweet IDs from database")
-        processed_ids = get_existing_tweet_ids()
-        pending_ids = source_ids - processed_ids
+        logger.info("Checking source tweet IDs against database")
+        pending_ids = filter_new_tweet_ids(source_ids)
         logger.info(f"Found {len(pending_ids)} pending tweets")
         return pending_ids
 
@@ -87,12 +86,11 @@ class PendingTweetsFinder:
         """
         logger.info("Calculating tweet statistics")
         source_ids = self.load_source_tweet_ids()
-        processed_ids = get_existing_tweet_ids()
-        pending_ids = source_ids - processed_ids
+        pending_ids = filter_new_tweet_ids(source_ids)
         
         stats = {
             "total_tweets": len(source_ids),
-            "processed_tweets": len(processed_ids),
+            "processed_tweets": get_total_tweets(),
             "pending_tweets": len(pending_ids)
         }
         logger.debug(f"Tweet statistics: {stats}")
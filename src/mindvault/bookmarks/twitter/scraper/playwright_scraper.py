@@ -3,9 +3,10 @@
 This module handles scraping tweets using Playwright to intercept Twitter's GraphQL API calls.
 """
 
-import time
+from itertools import chain
 from pathlib import Path
-from typing import List
+from typing import List, Optional
+import orjson
 from tenacity import (
     before_sleep_log,
     retry,
@@ -15,7 +16,14 @@ from tenacity import (
     wait_fixed,
 )
 from tqdm import tqdm
-from playwright.sync_api import sync_playwright, Error, Response
+from playwright.sync_api import (
+    sync_playwright,
+    Browser,
+    Error,
+    Playwright,
+    Response,
+    TimeoutError as PlaywrightTimeoutError,
+)
 
 from mindvault.core.config import settings
 from mindvault.core.logger_setup import get_logger, logger as base_logger
@@ -23,6 +31,22 @@ from mindvault.bookmarks.twitter.scraper.base import BaseTweetScraper, TweetNotF
 
 logger = get_logger(__name__)
 
+# Top-level key of TweetDetail GraphQL payloads holding the conversation timeline
+CONVERSATION_KEY = "threaded_conversation_with_injections_v2"
+
+
+# Resource types GraphQL API calls are issued as; images, scripts etc. are skipped
+_API_RESOURCE_TYPES = frozenset({"xhr", "fetch"})
+
+
+def is_tweet_detail_response(response: Response) -> bool:
+    """Check whether a response comes from the TweetDetail GraphQL API."""
+    # Cheap resource type check first: most responses on a tweet page are media
+    if response.request.resource_type not in _API_RESOURCE_TYPES:
+        return False
+    url = response.url
+    return "/i/api/graphql/" in url and "/TweetDetail" in url
+
 
 class PlaywrightScraper(BaseTweetScraper):
     """Handles scraping tweet data from Twitter using Playwright.
@@ -33,6 +57,7 @@ class PlaywrightScraper(BaseTweetScraper):
     Attributes:
         chrome_debug_port: Port for Chrome debugging connection
         captured_data: List to store intercepted tweet data
+        seen_entry_ids: Timeline entry IDs already captured for the current tweet
         initial_load_complete: Flag for first TweetDetail response
         next_response_received: Flag for subsequent responses after scrolling
     """
@@ -52,8 +77,34 @@ class PlaywrightScraper(BaseTweetScraper):
         super().__init__(input_file)
         self.chrome_debug_port = chrome_debug_port
         self.captured_data = []
+        self.seen_entry_ids = set()
         self.initial_load_complete = False
         self.next_response_received = False
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+
+    def _get_browser(self) -> Browser:
+        """Get the CDP connection to Chrome, starting Playwright on first use.
+
+        The driver and connection are kept across tweets so each tweet only
+        pays for opening a page, not for a new Playwright session.
+        """
+        if self._browser is None or not self._browser.is_connected():
+            if self._playwright is None:
+                self._playwright = sync_playwright().start()
+            # Connect to the existing Chrome instance via the debugging port
+            self._browser = self._playwright.chromium.connect_over_cdp(
+                f"http://127.0.0.1:{self.chrome_debug_port}"
+            )
+            logger.debug(f"Successfully connected to Chrome over CDP on port {self.chrome_debug_port}")
+        return self._browser
+
+    def close(self) -> None:
+        """Disconnect from Chrome and stop the Playwright driver."""
+        if self._playwright is not None:
+            self._playwright.stop()
+        self._playwright = None
+        self._browser = None
 
     def format_output_json(self, data: List[dict]) -> dict:
         """Format multiple tweet responses into a single structured response.
@@ -64,22 +115,51 @@ class PlaywrightScraper(BaseTweetScraper):
         Returns:
             Formatted JSON structure containing all tweet data
         """
-        out = {"threaded_conversation_with_injections_v2": {
-            "instructions": [{"type": "TimelineAddEntries", "entries": []}]
+        conversations = (
+            item["data"][CONVERSATION_KEY]
+            for item in data
+            if "data" in item and CONVERSATION_KEY in item["data"]
+        )
+        # Concatenate the entries of every TimelineAddEntries instruction in one pass
+        entries = list(chain.from_iterable(
+            instruction["entries"]
+            for conversation in conversations
+            for instruction in conversation["instructions"] or ()
+            if instruction.get("type") == "TimelineAddEntries" and "entries" in instruction
+        ))
+        return {CONVERSATION_KEY: {
+            "instructions": [{"type": "TimelineAddEntries", "entries": entries}]
         }}
-        for item in data:
-            # Follow the same pattern as the experimental script
-            if "data" in item and "threaded_conversation_with_injections_v2" in item["data"]:
-                instructions = item["data"]["threaded_conversation_with_injections_v2"]["instructions"]
-                if instructions:
-                    # Iterate through all instructions to find TimelineAddEntries
-                    for instruction in instructions:
-                        if (instruction.get("type") == "TimelineAddEntries" and 
-                            "entries" in instruction):
-                            out["threaded_conversation_with_injections_v2"]["instructions"][0]["entries"].extend(
-                                instruction["entries"]
-                            )
-        return out
+
+    def drop_seen_entries(self, data: dict) -> int:
+        """Remove timeline entries already captured from earlier responses.
+
+        Paginated TweetDetail responses often repeat entries, so each entry is
+        kept only the first time its entryId is seen.
+
+        Args:
+            data: Parsed TweetDetail response, filtered in place
+
+        Returns:
+            Number of new entries left in the response
+        """
+        seen = self.seen_entry_ids
+        new_count = 0
+        conversation = (data.get("data") or {}).get(CONVERSATION_KEY) or {}
+        for instruction in conversation.get("instructions") or ():
+            if instruction.get("type") != "TimelineAddEntries" or "entries" not in instruction:
+                continue
+            new_entries = []
+            for entry in instruction["entries"]:
+                entry_id = entry.get("entryId")
+                if entry_id in seen:
+                    continue
+                if entry_id is not None:
+                    seen.add(entry_id)
+                new_entries.append(entry)
+            instruction["entries"] = new_entries
+            new_count += len(new_entries)
+        return new_count
 
     def handle_response(self, response: Response) -> None:
         """Callback function to handle network responses, capturing raw TweetDetail JSON.
@@ -88,11 +168,15 @@ class PlaywrightScraper(BaseTweetScraper):
             response: Playwright Response object
         """
         # Check if the URL matches the pattern for TweetDetail GraphQL API
-        if "/i/api/graphql/" in response.url and "/TweetDetail" in response.url:
+        if is_tweet_detail_response(response):
             try:
-                data = response.json()
+                data = orjson.loads(response.body())
                 logger.debug("TweetDetail response JSON successfully parsed")
-                self.captured_data.append(data)
+                # Always keep the first response; later ones only if they add entries
+                if self.drop_seen_entries(data) or not self.captured_data:
+                    self.captured_data.append(data)
+                else:
+                    logger.debug("TweetDetail response contained no new entries")
 
                 # Signal that a response was received for pagination control
                 if not self.initial_load_complete:
@@ -107,7 +191,9 @@ class PlaywrightScraper(BaseTweetScraper):
                 logger.error(f"Error processing TweetDetail response: {e}")
                 try:
                     # Print text if JSON parsing fails
-                    logger.debug(f"Response Text (first 500 chars): {response.text()[:500]}...")
+                    logger.opt(lazy=True).debug(
+                        "Response Text (first 500 chars): {}...", lambda: response.text()[:500]
+                    )
                 except Exception as text_e:
                     logger.error(f"Error getting response text: {text_e}")
 
@@ -136,28 +222,30 @@ class PlaywrightScraper(BaseTweetScraper):
         """
         # Reset state for each tweet
         self.captured_data = []
+        self.seen_entry_ids = set()
         self.initial_load_complete = False
         self.next_response_received = False
 
-        with sync_playwright() as playwright:
+        try:
+            # Reuse the Chrome connection across tweets
+            browser = self._get_browser()
+
+            # Get the default context or create a new one if needed
+            if not browser.contexts:
+                logger.warning("No browser contexts found. Creating a new context")
+                context = browser.new_context()
+                logger.debug("Created a new browser context")
+            else:
+                context = browser.contexts[0]
+                logger.debug("Using existing browser context")
+
+            # Create a new page within this context
+            page = context.new_page()
+            logger.debug("Created a new page in the browser context")
+
+            # The page is closed however the scrape ends, so its response listener
+            # can't keep capturing into the next tweet's data
             try:
-                # Connect to the existing Chrome instance via the debugging port
-                browser = playwright.chromium.connect_over_cdp(f"http://127.0.0.1:{self.chrome_debug_port}")
-                logger.debug(f"Successfully connected to Chrome over CDP on port {self.chrome_debug_port}")
-
-                # Get the default context or create a new one if needed
-                if not browser.contexts:
-                    logger.warning("No browser contexts found. Creating a new context")
-                    context = browser.new_context()
-                    logger.debug("Created a new browser context")
-                else:
-                    context = browser.contexts[0]
-                    logger.debug("Using existing browser context")
-
-                # Create a new page within this context
-                page = context.new_page()
-                logger.debug("Created a new page in the browser context")
-
                 # Set the color scheme to no-preference to respect the browser's theme
                 page.emulate_media(color_scheme="no-preference")
 
@@ -167,25 +255,31 @@ class PlaywrightScraper(BaseTweetScraper):
                 # Navigate to the Tweet
                 tweet_url = f"https://x.com/i/status/{tweet_id}"
                 logger.info(f"Navigating to tweet {tweet_id}")
-                
+            
                 try:
                     page.goto(tweet_url, timeout=30000)
-                    logger.debug(f"Navigation to {page.title()} complete")
+                    # page.title() is a round trip to the browser, so only evaluate it when DEBUG is enabled
+                    logger.opt(lazy=True).debug("Navigation to {} complete", page.title)
                 except Exception as nav_error:
                     logger.error(f"Navigation failed: {nav_error}")
-                    page.close()
                     raise TweetNotFoundError(str(tweet_id), "Failed to navigate to tweet")
 
-                # Wait for the initial TweetDetail response
+                # Wait for the initial TweetDetail response. Playwright wakes us as soon as
+                # it arrives; handle_response may already have captured it during goto.
                 logger.debug("Waiting for the initial TweetDetail response...")
-                wait_start_time = time.time()
                 initial_wait_timeout = 30
-                while not self.initial_load_complete:
-                    page.wait_for_timeout(100)
-                    if time.time() - wait_start_time > initial_wait_timeout:
-                        logger.error(f"Timeout ({initial_wait_timeout}s) waiting for initial TweetDetail response")
-                        page.close()
-                        raise TweetNotFoundError(str(tweet_id), "Timeout waiting for tweet data")
+                if not self.initial_load_complete:
+                    try:
+                        page.wait_for_event(
+                            "response",
+                            predicate=is_tweet_detail_response,
+                            timeout=initial_wait_timeout * 1000,
+                        )
+                    except PlaywrightTimeoutError:
+                        pass
+                if not self.initial_load_complete:
+                    logger.error(f"Timeout ({initial_wait_timeout}s) waiting for initial TweetDetail response")
+                    raise TweetNotFoundError(str(tweet_id), "Timeout waiting for tweet data")
 
                 logger.debug("Initial TweetDetail response received. Starting pagination")
 
@@ -201,21 +295,25 @@ class PlaywrightScraper(BaseTweetScraper):
                     self.next_response_received = False
                     data_count_before_scroll = len(self.captured_data)
 
-                    # Scroll to the bottom of the page
-                    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-
-                    # Wait for the next TweetDetail response after scrolling
-                    wait_start_time = time.time()
+                    # Scroll to the bottom of the page and wait for the next TweetDetail response
                     scroll_wait_timeout = 5
-                    while not self.next_response_received:
-                        page.wait_for_timeout(100)
-                        if time.time() - wait_start_time > scroll_wait_timeout:
-                            logger.debug(f"Timeout waiting for TweetDetail response after scroll {scroll_count}")
-                            break
-
-                    # Add a small delay for rendering
-                    if self.next_response_received:
-                        page.wait_for_timeout(1000)
+                    response_received = False
+                    try:
+                        with page.expect_response(
+                            is_tweet_detail_response,
+                            timeout=scroll_wait_timeout * 1000,
+                        ):
+                            page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                        response_received = True
+                    except PlaywrightTimeoutError:
+                        logger.debug(f"Timeout waiting for TweetDetail response after scroll {scroll_count}")
+
+                    # Let follow-up requests settle instead of sleeping a fixed second
+                    if response_received:
+                        try:
+                            page.wait_for_load_state("networkidle", timeout=1000)
+                        except PlaywrightTimeoutError:
+                            pass
 
                     # Check if new data was captured
                     new_data_count = len(self.captured_data) - data_count_before_scroll
@@ -228,27 +326,29 @@ class PlaywrightScraper(BaseTweetScraper):
                         if stalled_scrolls >= 2:
                             logger.debug("Reached end of content (2 consecutive empty scrolls)")
                             break
-
-                # Clean up
+            finally:
                 page.remove_listener("response", self.handle_response)
-                page.close()
-
-                if not self.captured_data:
-                    raise TweetNotFoundError(str(tweet_id), "No tweet data captured")
-
-                # Format and return the captured data
-                formatted_data = self.format_output_json(self.captured_data)
-                logger.info(f"Successfully captured tweet data for {tweet_id}")
-                return formatted_data
-
-            except Error as playwright_error:
-                logger.error(f"Playwright error occurred: {playwright_error}")
-                raise TweetNotFoundError(str(tweet_id), f"Playwright error: {playwright_error}")
-            except Exception as e:
-                logger.error(f"Unexpected error occurred: {e}")
-                if "No tweet data captured" in str(e) or isinstance(e, TweetNotFoundError):
-                    raise
-                raise TweetNotFoundError(str(tweet_id), f"Unexpected error: {e}")
+                try:
+                    page.close()
+                except Error as close_error:
+                    logger.debug(f"Failed to close page: {close_error}")
+
+            if not self.captured_data:
+                raise TweetNotFoundError(str(tweet_id), "No tweet data captured")
+
+            # Format and return the captured data
+            formatted_data = self.format_output_json(self.captured_data)
+            logger.info(f"Successfully captured tweet data for {tweet_id}")
+            return formatted_data
+
+        except Error as playwright_error:
+            logger.error(f"Playwright error occurred: {playwright_error}")
+            raise TweetNotFoundError(str(tweet_id), f"Playwright error: {playwright_error}")
+        except Exception as e:
+            logger.error(f"Unexpected error occurred: {e}")
+            if "No tweet data captured" in str(e) or isinstance(e, TweetNotFoundError):
+                raise
+            raise TweetNotFoundError(str(tweet_id), f"Unexpected error: {e}")
 
     def scrape_tweets(self, max_consecutive_failures: int = 50) -> None:
         """Main method to scrape tweets using Playwright.
@@ -266,38 +366,41 @@ class PlaywrightScraper(BaseTweetScraper):
             "consecutive_failures": 0
         }
 
-        with tqdm(
-            total=total_tweets,
-            desc="Processing tweets",
-            unit="tweet",
-            ncols=100,
-            bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]"
-        ) as pbar:
-            for tweet_id in tweet_ids:
-                try:
-                    tweet_data = self.get_tweet_data(tweet_id)
-                    self.save_tweet_data(tweet_data, str(tweet_id))
+        try:
+            with tqdm(
+                total=total_tweets,
+                desc="Processing tweets",
+                unit="tweet",
+                ncols=100,
+                bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]"
+            ) as pbar:
+                for tweet_id in tweet_ids:
+                    try:
+                        tweet_data = self.get_tweet_data(tweet_id)
+                        self.save_tweet_data(tweet_data, str(tweet_id))
                     
-                    stats["consecutive_failures"] = 0
-                    stats["processed"] += 1
-                    pbar.update(1)
-                    pbar.set_postfix(
-                        failed=stats["failed"],
-                        consecutive_fails=stats["consecutive_failures"]
-                    )
-
-                except Exception as e:
-                    logger.error(f"Error processing tweet {tweet_id}: {e}")
-                    stats["failed"] += 1
-                    stats["consecutive_failures"] += 1
-                    pbar.set_postfix(
-                        failed=stats["failed"],
-                        consecutive_fails=stats["consecutive_failures"]
-                    )
-
-                    if stats["consecutive_failures"] >= max_consecutive_failures:
-                        logger.error(f"Stopping: {max_consecutive_failures} consecutive failures reached")
-                        break
+                        stats["consecutive_failures"] = 0
+                        stats["processed"] += 1
+                        pbar.update(1)
+                        pbar.set_postfix(
+                            failed=stats["failed"],
+                            consecutive_fails=stats["consecutive_failures"]
+                        )
+
+                    except Exception as e:
+                        logger.error(f"Error processing tweet {tweet_id}: {e}")
+                        stats["failed"] += 1
+                        stats["consecutive_failures"] += 1
+                        pbar.set_postfix(
+                            failed=stats["failed"],
+                            consecutive_fails=stats["consecutive_failures"]
+                        )
+
+                        if stats["consecutive_failures"] >= max_consecutive_failures:
+                            logger.error(f"Stopping: {max_consecutive_failures} consecutive failures reached")
+                            break
+        finally:
+            self.close()
 
         # Final statistics
         logger.info("Processing complete!")
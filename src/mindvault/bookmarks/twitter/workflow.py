@@ -11,7 +11,7 @@ import asyncio
 
 from mindvault.bookmarks.twitter.bookmarks import BookmarksExporter
 from mindvault.core.config import settings
-from mindvault.bookmarks.twitter.database import create_database, save_tweet_to_db, get_tweet_by_id
+from mindvault.bookmarks.twitter.database import create_database, save_tweet_ids_to_db, get_tweet_by_id
 from mindvault.core.logger_setup import get_logger
 from mindvault.bookmarks.twitter.pending import PendingTweetsFinder
 from mindvault.bookmarks.twitter.scraper.playwright_scraper import PlaywrightScraper
@@ -24,10 +24,18 @@ from mindvault.bookmarks.twitter.extract import (
 from mindvault.bookmarks.twitter.download_tweet_media_object_storage import (
     download_tweet_media_to_blob_storage,
 )
+from mindvault.bookmarks.twitter.media_download import (
+    DEFAULT_MAX_CONNECTIONS,
+    close_shared_http_client,
+)
 from mindvault.core.mongodb_utils import save_extracted_tweet, get_extracted_media_for_tweets
 
 logger = get_logger(__name__)
 
+# Processed tweet IDs are written to the database in batches of this size, so an
+# interrupted run only has to redo the tweets since the last batch
+TWEET_ID_SAVE_BATCH_SIZE = 25
+
 class WorkflowManager:
     """Manages the entire workflow of the MindVault Twitter application.
     
@@ -160,11 +168,15 @@ class WorkflowManager:
         with open(temp_ids_file, 'w', encoding='utf-8') as f:
             json.dump(pending_list, f)
         
+        # One scraper (and one Chrome connection) serves every pending tweet
+        scraper = PlaywrightScraper(
+            input_file=temp_ids_file,
+        )
+        
+        # Processed tweets not yet recorded in the database
+        unsaved_tweets: List[str] = []
+        
         try:
-            scraper = PlaywrightScraper(
-                input_file=temp_ids_file,
-            )
-            
             for tweet_id in pending_list:
                 try:
                     # Skip if already in database
@@ -179,8 +191,7 @@ class WorkflowManager:
                     # Extract and save valuable data
                     try:
                         self.extract_and_save_tweet_data(tweet_id, tweet_data)
-                        # Only save to SQLite if extraction was successful
-                        save_tweet_to_db(tweet_id)
+                        # Only saved to SQLite (in batches below) if extraction was successful
                         logger.info(f"Successfully processed and saved tweet {tweet_id}")
                     except Exception as e:
                         logger.error(f"Failed to extract data from tweet {tweet_id}: {e}")
@@ -190,20 +201,32 @@ class WorkflowManager:
                     
                     # Track processed tweet for this run
                     self.processed_tweets.append(tweet_id)
+                    unsaved_tweets.append(tweet_id)
                     logger.info(f"Successfully processed tweet {tweet_id}")
                     
+                    if len(unsaved_tweets) >= TWEET_ID_SAVE_BATCH_SIZE:
+                        save_tweet_ids_to_db(unsaved_tweets)
+                        unsaved_tweets = []
+                    
                 except Exception as e:
                     logger.error(f"Error processing tweet {tweet_id}: {e}")
                     # Continue with next tweet
                     continue
                     
         finally:
-            # Clean up temporary file
-            temp_ids_file.unlink(missing_ok=True)
+            try:
+                # Record the remaining processed tweets before anything else can fail
+                save_tweet_ids_to_db(unsaved_tweets)
+            finally:
+                scraper.close()
+                # Clean up temporary file
+                temp_ids_file.unlink(missing_ok=True)
             
         return self.processed_tweets
     
-    def download_media_for_tweets(self, tweet_ids: List[str], max_connections: int = 50) -> None:
+    def download_media_for_tweets(
+        self, tweet_ids: List[str], max_connections: int = DEFAULT_MAX_CONNECTIONS
+    ) -> None:
         """Download media only for specified tweets.
         
         Args:
@@ -233,13 +256,18 @@ class WorkflowManager:
                 f"(bucket: {blob_connection.bucket_name})"
             )
 
+            async def _download() -> None:
+                try:
+                    await download_tweet_media_to_blob_storage(
+                        media_list=ExtractedMediaList(media=all_media),
+                        max_connections=max_connections,
+                        write_if_absent=True,
+                    )
+                finally:
+                    await close_shared_http_client()
+
             # Download media and upload to configured object storage.
-            asyncio.run(
-                download_tweet_media_to_blob_storage(
-                    media_list=ExtractedMediaList(media=all_media),
-                    max_connections=max_connections
-                )
-            )
+            asyncio.run(_download())
             
             logger.info("Media download completed for current run")
             
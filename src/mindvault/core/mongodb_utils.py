@@ -54,7 +54,7 @@ def save_raw_tweet(tweet_id: str, data: Dict[str, Any]) -> str:
             upsert=True
         )
         action = "Updated" if result.modified_count > 0 else "Inserted"
-        logger.debug(f"{action} raw tweet data for ID {tweet_id}")
+        logger.debug("{} raw tweet data for ID {}", action, tweet_id)
         return tweet_id
     except Exception as e:
         logger.error(f"Error saving raw tweet {tweet_id} to MongoDB: {e}")
@@ -78,7 +78,7 @@ def save_extracted_tweet(tweet_id: str, data: Dict[str, Any]) -> str:
             upsert=True
         )
         action = "Updated" if result.modified_count > 0 else "Inserted"
-        logger.debug(f"{action} extracted tweet data for ID {tweet_id}")
+        logger.debug("{} extracted tweet data for ID {}", action, tweet_id)
         return tweet_id
     except Exception as e:
         logger.error(f"Error saving extracted tweet {tweet_id} to MongoDB: {e}")
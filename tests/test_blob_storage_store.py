@@ -1,21 +1,31 @@
+import asyncio
 import os
 import unittest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
-from botocore.exceptions import ClientError
+import httpx
+from botocore.exceptions import ClientError, EndpointConnectionError
 
 os.environ.setdefault("TWITTER_CT0", "test-ct0")
 os.environ.setdefault("TWITTER_AUTH_TOKEN", "test-auth")
 os.environ.setdefault("VALIDATE_EXTERNAL_SERVICES_ON_STARTUP", "false")
 
+from mindvault.bookmarks.twitter import download_tweet_media_object_storage as object_storage
 from mindvault.bookmarks.twitter.download_tweet_media_object_storage import (
+    S3CompatibleMediaStore,
     _check_object_exists,
     _ensure_bucket_exists,
     _upload_stream_to_s3_compatible,
     build_s3_uri,
 )
 from mindvault.bookmarks.twitter.extract import ExtractedMedia, ExtractedMediaList
-from mindvault.bookmarks.twitter.media_download import download_media
+from mindvault.bookmarks.twitter.media_download import (
+    _get_shared_client,
+    close_shared_http_client,
+    download_media,
+    download_media_stream,
+    prefetch_stream,
+)
 from mindvault.core.config import BlobStorageConnection
 
 
@@ -24,17 +34,54 @@ async def _stream_chunks(chunks):
         yield chunk
 
 
-def _make_head_bucket_error(code: str, status_code: int) -> ClientError:
+class _ByteStream(httpx.AsyncByteStream):
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+    async def __aiter__(self):
+        yield self.data
+
+
+def _make_s3_store() -> S3CompatibleMediaStore:
+    connection = BlobStorageConnection(
+        provider="minio",
+        endpoint_url="http://localhost:9000",
+        access_key="x",
+        secret_key="y",
+        bucket_name="mindvault-media",
+        region="us-east-1",
+        addressing_style="path",
+        verify_ssl=False,
+        auto_create_bucket=False,
+    )
+    with patch.object(
+        type(object_storage.settings), "get_blob_storage_connection", return_value=connection
+    ):
+        store = S3CompatibleMediaStore()
+    store.s3_client = AsyncMock()
+    return store
+
+
+def _make_client_error(
+    code: str, status_code: int, operation_name: str = "HeadBucket"
+) -> ClientError:
     return ClientError(
         error_response={
             "Error": {"Code": code, "Message": "error"},
             "ResponseMetadata": {"HTTPStatusCode": status_code},
         },
-        operation_name="HeadBucket",
+        operation_name=operation_name,
     )
 
 
 class BlobStorageStoreTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        object_storage._known_buckets.clear()
+        self.addCleanup(object_storage._known_buckets.clear)
+        patcher = patch.object(object_storage, "_conditional_puts_supported", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     async def test_ensure_bucket_exists_creates_bucket_when_missing(self) -> None:
         connection = BlobStorageConnection(
             provider="minio",
@@ -48,7 +95,7 @@ class BlobStorageStoreTests(unittest.IsolatedAsyncioTestCase):
             auto_create_bucket=True,
         )
         s3_client = AsyncMock()
-        s3_client.head_bucket.side_effect = _make_head_bucket_error("404", 404)
+        s3_client.head_bucket.side_effect = _make_client_error("404", 404)
 
         await _ensure_bucket_exists(s3_client, connection)
 
@@ -67,7 +114,7 @@ class BlobStorageStoreTests(unittest.IsolatedAsyncioTestCase):
             auto_create_bucket=False,
         )
         s3_client = AsyncMock()
-        s3_client.head_bucket.side_effect = _make_head_bucket_error("NoSuchBucket", 404)
+        s3_client.head_bucket.side_effect = _make_client_error("NoSuchBucket", 404)
 
         with self.assertRaises(ConnectionError):
             await _ensure_bucket_exists(s3_client, connection)
@@ -85,13 +132,21 @@ class BlobStorageStoreTests(unittest.IsolatedAsyncioTestCase):
             auto_create_bucket=True,
         )
         s3_client = AsyncMock()
-        s3_client.head_bucket.side_effect = _make_head_bucket_error("AccessDenied", 403)
+        s3_client.head_bucket.side_effect = _make_client_error("AccessDenied", 403)
 
         with self.assertRaises(ClientError):
             await _ensure_bucket_exists(s3_client, connection)
 
         s3_client.create_bucket.assert_not_awaited()
 
+    async def test_ensure_bucket_exists_checks_each_bucket_once(self) -> None:
+        store = _make_s3_store()
+
+        await _ensure_bucket_exists(store.s3_client, store.connection)
+        await _ensure_bucket_exists(store.s3_client, store.connection)
+
+        store.s3_client.head_bucket.assert_awaited_once_with(Bucket="mindvault-media")
+
     async def test_check_object_exists_respects_content_length(self) -> None:
         s3_client = AsyncMock()
         s3_client.head_object.return_value = {"ContentLength": 128}
@@ -101,9 +156,8 @@ class BlobStorageStoreTests(unittest.IsolatedAsyncioTestCase):
         s3_client.head_object.return_value = {"ContentLength": 0}
         self.assertFalse(await _check_object_exists(s3_client, "bucket", "key"))
 
-    async def test_upload_stream_aborts_empty_file(self) -> None:
+    async def test_upload_stream_skips_empty_file(self) -> None:
         s3_client = AsyncMock()
-        s3_client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
 
         success = await _upload_stream_to_s3_compatible(
             s3_client=s3_client,
@@ -113,22 +167,437 @@ class BlobStorageStoreTests(unittest.IsolatedAsyncioTestCase):
         )
 
         self.assertFalse(success)
-        s3_client.abort_multipart_upload.assert_awaited_once()
+        s3_client.put_object.assert_not_awaited()
+        s3_client.create_multipart_upload.assert_not_awaited()
 
-    async def test_upload_stream_completes_for_non_empty_file(self) -> None:
+    async def test_upload_stream_puts_small_file_in_one_request(self) -> None:
         s3_client = AsyncMock()
-        s3_client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
-        s3_client.upload_part.return_value = {"ETag": "etag-1"}
+
+        success = await _upload_stream_to_s3_compatible(
+            s3_client=s3_client,
+            stream=_stream_chunks([b"abc", b"def"]),
+            bucket_name="bucket",
+            key="tweet/media.jpg",
+            content_type="image/jpeg",
+        )
+
+        self.assertTrue(success)
+        s3_client.put_object.assert_awaited_once_with(
+            Bucket="bucket",
+            Key="tweet/media.jpg",
+            Body=b"abcdef",
+            ContentType="image/jpeg",
+        )
+        s3_client.create_multipart_upload.assert_not_awaited()
+
+    async def test_upload_stream_treats_precondition_failure_as_stored(self) -> None:
+        s3_client = AsyncMock()
+        s3_client.put_object.side_effect = _make_client_error("PreconditionFailed", 412, "PutObject")
 
         success = await _upload_stream_to_s3_compatible(
             s3_client=s3_client,
             stream=_stream_chunks([b"abc"]),
             bucket_name="bucket",
             key="tweet/media.jpg",
+            if_absent=True,
+        )
+
+        self.assertTrue(success)
+        s3_client.put_object.assert_awaited_once()
+
+    async def test_upload_stream_falls_back_without_conditional_writes(self) -> None:
+        s3_client = AsyncMock()
+        s3_client.put_object.side_effect = [
+            _make_client_error("NotImplemented", 501, "PutObject"),
+            None,
+            None,
+        ]
+
+        for _ in range(2):
+            await _upload_stream_to_s3_compatible(
+                s3_client=s3_client,
+                stream=_stream_chunks([b"abc"]),
+                bucket_name="bucket",
+                key="tweet/media.jpg",
+                if_absent=True,
+            )
+
+        self.assertEqual(
+            ["IfNoneMatch" in call.kwargs for call in s3_client.put_object.await_args_list],
+            [True, False, False],
+        )
+
+    async def test_upload_stream_uploads_parts_in_stream_order(self) -> None:
+        s3_client = AsyncMock()
+        s3_client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+
+        async def upload_part(*, PartNumber, Body, **_kwargs):
+            # Later parts finish first
+            await asyncio.sleep(0.01 * (4 - PartNumber))
+            return {"ETag": f"etag-{PartNumber}-{Body.decode()}"}
+
+        s3_client.upload_part.side_effect = upload_part
+
+        success = await _upload_stream_to_s3_compatible(
+            s3_client=s3_client,
+            stream=_stream_chunks([b"ab", b"cde", b"f"]),
+            bucket_name="bucket",
+            key="tweet/media.jpg",
+            multipart_threshold=2,
+            part_size=2,
         )
 
         self.assertTrue(success)
-        s3_client.complete_multipart_upload.assert_awaited_once()
+        s3_client.complete_multipart_upload.assert_awaited_once_with(
+            Bucket="bucket",
+            Key="tweet/media.jpg",
+            UploadId="upload-1",
+            MultipartUpload={
+                "Parts": [
+                    {"PartNumber": 1, "ETag": "etag-1-ab"},
+                    {"PartNumber": 2, "ETag": "etag-2-cde"},
+                    {"PartNumber": 3, "ETag": "etag-3-f"},
+                ]
+            },
+        )
+
+    async def test_upload_stream_splits_buffered_data_into_parts(self) -> None:
+        s3_client = AsyncMock()
+        s3_client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+        s3_client.upload_part.side_effect = lambda *, PartNumber, Body, **_kwargs: {
+            "ETag": f"etag-{PartNumber}-{Body.decode()}"
+        }
+
+        success = await _upload_stream_to_s3_compatible(
+            s3_client=s3_client,
+            stream=_stream_chunks([b"ab", b"cd", b"ef"]),
+            bucket_name="bucket",
+            key="tweet/media.jpg",
+            multipart_threshold=4,
+            part_size=2,
+        )
+
+        self.assertTrue(success)
+        s3_client.put_object.assert_not_awaited()
+        parts = s3_client.complete_multipart_upload.await_args.kwargs["MultipartUpload"]["Parts"]
+        self.assertEqual(
+            [part["ETag"] for part in parts],
+            ["etag-1-ab", "etag-2-cd", "etag-3-ef"],
+        )
+
+    async def test_upload_stream_limits_parts_in_flight(self) -> None:
+        s3_client = AsyncMock()
+        s3_client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+        in_flight = 0
+        peak = 0
+
+        async def upload_part(*, PartNumber, **_kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"ETag": f"etag-{PartNumber}"}
+
+        s3_client.upload_part.side_effect = upload_part
+
+        success = await _upload_stream_to_s3_compatible(
+            s3_client=s3_client,
+            stream=_stream_chunks([b"ab"] * 6),
+            bucket_name="bucket",
+            key="tweet/media.jpg",
+            multipart_threshold=2,
+            part_size=2,
+            part_concurrency=2,
+        )
+
+        self.assertTrue(success)
+        self.assertEqual(s3_client.upload_part.await_count, 6)
+        self.assertEqual(peak, 2)
+
+    async def test_upload_stream_aborts_when_a_part_fails(self) -> None:
+        s3_client = AsyncMock()
+        s3_client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+        s3_client.upload_part.side_effect = IOError("part failed")
+
+        with self.assertRaises(IOError):
+            await _upload_stream_to_s3_compatible(
+                s3_client=s3_client,
+                stream=_stream_chunks([b"ab", b"cd"]),
+                bucket_name="bucket",
+                key="tweet/media.jpg",
+                multipart_threshold=2,
+                part_size=2,
+            )
+
+        s3_client.abort_multipart_upload.assert_awaited_once()
+        s3_client.complete_multipart_upload.assert_not_awaited()
+
+    async def test_prefetch_stream_preserves_chunks_and_errors(self) -> None:
+        async def failing_stream():
+            yield b"a"
+            yield b"b"
+            raise IOError("connection reset")
+
+        self.assertEqual(
+            [chunk async for chunk in prefetch_stream(_stream_chunks([b"a", b"b", b"c"]), max_chunks=1)],
+            [b"a", b"b", b"c"],
+        )
+
+        received = []
+        with self.assertRaises(IOError):
+            async for chunk in prefetch_stream(failing_stream()):
+                received.append(chunk)
+        self.assertEqual(received, [b"a", b"b"])
+
+    async def test_download_media_stream_resumes_with_range_after_disconnect(self) -> None:
+        body = b"0123456789"
+        requests = []
+
+        class DroppingStream(httpx.AsyncByteStream):
+            async def __aiter__(self):
+                yield body[:4]
+                raise httpx.ReadError("connection reset")
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(dict(request.headers))
+            if "range" not in request.headers:
+                return httpx.Response(200, headers={"etag": '"v1"'}, stream=DroppingStream())
+            return httpx.Response(
+                206,
+                headers={"content-range": f"bytes 4-9/{len(body)}"},
+                stream=_ByteStream(body[4:]),
+            )
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            chunks = [
+                chunk
+                async for chunk in download_media_stream(client, "https://example.com/video.mp4", chunk_size=2)
+            ]
+
+        self.assertEqual(b"".join(chunks), body)
+        self.assertEqual(requests[1]["range"], "bytes=4-")
+        self.assertEqual(requests[1]["if-range"], '"v1"')
+
+    async def test_download_media_stream_skips_resent_bytes_when_range_is_ignored(self) -> None:
+        body = b"0123456789"
+        requests = []
+
+        class DroppingStream(httpx.AsyncByteStream):
+            async def __aiter__(self):
+                yield body[:3]
+                yield body[3:5]
+                raise httpx.ReadError("connection reset")
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(dict(request.headers))
+            if len(requests) == 1:
+                return httpx.Response(200, headers={"etag": '"v1"'}, stream=DroppingStream())
+            return httpx.Response(200, headers={"etag": '"v1"'}, stream=_ByteStream(body))
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            chunks = [
+                chunk
+                async for chunk in download_media_stream(client, "https://example.com/video.mp4", chunk_size=2)
+            ]
+
+        self.assertEqual(b"".join(chunks), body)
+        self.assertEqual(requests[1]["range"], "bytes=4-")
+
+    async def test_download_media_stream_refetches_whole_file_after_416(self) -> None:
+        body = b"0123456789"
+        requests = []
+
+        class DroppingStream(httpx.AsyncByteStream):
+            async def __aiter__(self):
+                yield body[:4]
+                raise httpx.ReadError("connection reset")
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(dict(request.headers))
+            if "range" in request.headers:
+                return httpx.Response(416)
+            if len(requests) == 1:
+                return httpx.Response(200, headers={"last-modified": "Mon"}, stream=DroppingStream())
+            return httpx.Response(200, headers={"last-modified": "Mon"}, stream=_ByteStream(body))
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            chunks = [
+                chunk
+                async for chunk in download_media_stream(client, "https://example.com/video.mp4", chunk_size=2)
+            ]
+
+        self.assertEqual(b"".join(chunks), body)
+        self.assertEqual(len(requests), 3)
+        self.assertNotIn("range", requests[2])
+
+    async def test_download_media_stream_raises_retryable_error_when_resume_is_rejected(self) -> None:
+        class DroppingStream(httpx.AsyncByteStream):
+            async def __aiter__(self):
+                yield b"0123"
+                raise httpx.ReadError("connection reset")
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if "range" not in request.headers:
+                return httpx.Response(200, headers={"etag": '"v1"'}, stream=DroppingStream())
+            return httpx.Response(403)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with self.assertRaises(IOError) as ctx:
+                async for _ in download_media_stream(client, "https://example.com/video.mp4", chunk_size=2):
+                    pass
+
+        self.assertNotIsInstance(ctx.exception, httpx.HTTPStatusError)
+
+    async def test_download_media_stream_raises_when_server_ignores_range(self) -> None:
+        class DroppingStream(httpx.AsyncByteStream):
+            async def __aiter__(self):
+                yield b"0123"
+                raise httpx.ReadError("connection reset")
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if "range" not in request.headers:
+                return httpx.Response(200, stream=DroppingStream())
+            return httpx.Response(200, stream=_ByteStream(b"0123456789"))
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with self.assertRaises(IOError):
+                async for _ in download_media_stream(client, "https://example.com/video.mp4", chunk_size=2):
+                    pass
+
+    async def test_download_media_prewarms_each_media_host_once(self) -> None:
+        media_list = ExtractedMediaList(
+            media=[
+                ExtractedMedia(
+                    tweet_id="123",
+                    media_id=f"media-{i}",
+                    media_url=url,
+                    media_type="image",
+                )
+                for i, url in enumerate([
+                    "https://pbs.twimg.com/media/a.jpg?name=orig",
+                    "https://pbs.twimg.com/media/b.jpg",
+                    "https://video.twimg.com/ext_tw_video/c.mp4",
+                ])
+            ]
+        )
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append((request.method, str(request.url)))
+            return httpx.Response(200)
+
+        class ExistingStore:
+            async def prepare(self) -> None:
+                return None
+
+            def get_location(self, item):
+                return f"s3://mindvault-media/{item.media_id}"
+
+            async def exists(self, _item) -> bool:
+                return True
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch(
+            "mindvault.bookmarks.twitter.media_download._create_http_client",
+            AsyncMock(return_value=client),
+        ):
+            await download_media(
+                media_list=media_list,
+                store=ExistingStore(),
+                prewarm=True,
+                progress_desc="test",
+            )
+            await close_shared_http_client()
+
+        self.assertEqual(
+            sorted(requests),
+            [("HEAD", "https://pbs.twimg.com/"), ("HEAD", "https://video.twimg.com/")],
+        )
+
+    async def test_exists_bulk_lists_each_tweet_prefix(self) -> None:
+        pages = {
+            "123/": [{"Contents": [{"Key": "123/a.jpg", "Size": 10}, {"Key": "123/b.jpg", "Size": 0}]}],
+            "456/": [{}],
+        }
+
+        async def paginate(*, Bucket, Prefix):
+            for page in pages[Prefix]:
+                yield page
+
+        store = _make_s3_store()
+        store.s3_client.get_paginator = MagicMock(return_value=MagicMock(paginate=paginate))
+        items = [
+            ExtractedMedia(tweet_id=tweet_id, media_id=media_id, media_url=f"https://example.com/{media_id}.jpg", media_type="image")
+            for tweet_id, media_id in [("123", "a"), ("123", "b"), ("456", "c")]
+        ]
+
+        existing = await store.exists_bulk(items)
+
+        self.assertEqual(existing, {"s3://mindvault-media/123/a.jpg"})
+        store.s3_client.get_paginator.assert_called_once_with("list_objects_v2")
+
+    async def test_exists_bulk_returns_none_when_listing_is_denied(self) -> None:
+        async def paginate(**_kwargs):
+            raise ClientError(
+                error_response={"Error": {"Code": "AccessDenied", "Message": "denied"}},
+                operation_name="ListObjectsV2",
+            )
+            yield
+
+        store = _make_s3_store()
+        store.s3_client.get_paginator = MagicMock(return_value=MagicMock(paginate=paginate))
+        item = ExtractedMedia(tweet_id="123", media_id="a", media_url="https://example.com/a.jpg", media_type="image")
+
+        self.assertIsNone(await store.exists_bulk([item]))
+
+    async def test_exists_bulk_returns_none_when_listing_cannot_connect(self) -> None:
+        async def paginate(*, Bucket, Prefix):
+            if Prefix == "456/":
+                raise EndpointConnectionError(endpoint_url="http://localhost:9000")
+            yield {"Contents": [{"Key": "123/a.jpg", "Size": 10}]}
+
+        store = _make_s3_store()
+        store.s3_client.get_paginator = MagicMock(return_value=MagicMock(paginate=paginate))
+        items = [
+            ExtractedMedia(tweet_id=tweet_id, media_id="a", media_url="https://example.com/a.jpg", media_type="image")
+            for tweet_id in ("123", "456")
+        ]
+
+        self.assertIsNone(await store.exists_bulk(items))
+
+    async def test_download_media_skips_items_found_by_exists_bulk(self) -> None:
+        item = ExtractedMedia(
+            tweet_id="123",
+            media_id="media-1",
+            media_url="https://example.com/image.jpg",
+            media_type="image",
+        )
+
+        class BulkStore:
+            async def prepare(self) -> None:
+                return None
+
+            def get_location(self, _item):
+                return "s3://mindvault-media/123/media-1.jpg"
+
+            async def exists_bulk(self, _items):
+                return {"s3://mindvault-media/123/media-1.jpg"}
+
+            async def exists(self, _item) -> bool:
+                raise AssertionError("exists() should not be called")
+
+        with patch(
+            "mindvault.bookmarks.twitter.media_download._create_http_client",
+            AsyncMock(return_value=AsyncMock(is_closed=False)),
+        ):
+            result = await download_media(
+                media_list=ExtractedMediaList(media=[item]),
+                store=BulkStore(),
+                progress_desc="test",
+            )
+
+        self.assertEqual(result["123"], ["s3://mindvault-media/123/media-1.jpg"])
 
     async def test_download_media_retries_after_transient_store_failure(self) -> None:
         item = ExtractedMedia(
@@ -188,6 +657,317 @@ class BlobStorageStoreTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(store.calls, 2)
         self.assertEqual(result["123"], ["s3://mindvault-media/123/media-1.jpg"])
 
+    async def test_download_media_does_not_retry_client_errors(self) -> None:
+        item = ExtractedMedia(
+            tweet_id="123",
+            media_id="media-1",
+            media_url="https://example.com/image.jpg",
+            media_type="image",
+        )
+        request = httpx.Request("GET", item.media_url)
+        not_found = httpx.HTTPStatusError(
+            "not found", request=request, response=httpx.Response(404, request=request)
+        )
+        store = MagicMock()
+        store.prepare = AsyncMock()
+        store.save = AsyncMock(side_effect=not_found)
+
+        with patch(
+            "mindvault.bookmarks.twitter.media_download._create_http_client",
+            AsyncMock(return_value=AsyncMock()),
+        ), patch(
+            "mindvault.bookmarks.twitter.media_download.download_media_stream",
+            side_effect=lambda client, url, chunk_size: _stream_chunks([]),
+        ):
+            result = await download_media(
+                media_list=ExtractedMediaList(media=[item]),
+                store=store,
+                max_retries=3,
+                retry_delay=0.0,
+                skip_existing=False,
+                progress_desc="test",
+            )
+
+        store.save.assert_awaited_once()
+        self.assertEqual(result, {})
+
+    async def test_download_to_blob_storage_reuses_given_store(self) -> None:
+        store = _make_s3_store()
+        media_list = ExtractedMediaList(media=[])
+        download = AsyncMock(return_value={"123": ["s3://mindvault-media/123/media-1.jpg"]})
+
+        with patch.object(object_storage, "download_media", download), patch.object(
+            object_storage, "S3CompatibleMediaStore"
+        ) as store_cls:
+            result = await object_storage.download_tweet_media_to_blob_storage(
+                media_list, store=store
+            )
+
+        store_cls.assert_not_called()
+        self.assertIs(download.await_args.kwargs["store"], store)
+        self.assertEqual(
+            download.await_args.kwargs["progress_desc"],
+            "Uploading to minio",
+        )
+        self.assertEqual(result, {"123": ["s3://mindvault-media/123/media-1.jpg"]})
+
+    async def test_download_to_blob_storage_writes_if_absent_only_on_request(self) -> None:
+        self.assertFalse(_make_s3_store().write_if_absent)
+        cases = (
+            ({}, False),
+            ({"write_if_absent": True}, True),
+            ({"write_if_absent": True, "skip_existing": False}, False),
+        )
+        for kwargs, expected in cases:
+            with self.subTest(**kwargs), patch.object(
+                object_storage, "download_media", AsyncMock(return_value={})
+            ), patch.object(object_storage, "S3CompatibleMediaStore") as store_cls:
+                store_cls.return_value.__aenter__.return_value = _make_s3_store()
+                await object_storage.download_tweet_media_to_blob_storage(
+                    ExtractedMediaList(media=[]), **kwargs
+                )
+
+            self.assertIs(store_cls.call_args.kwargs["write_if_absent"], expected)
+
+    async def test_download_media_downloads_duplicate_items_once(self) -> None:
+        item = ExtractedMedia(
+            tweet_id="123",
+            media_id="media-1",
+            media_url="https://example.com/image.jpg",
+            media_type="image",
+        )
+        store = MagicMock()
+        store.prepare = AsyncMock()
+        store.save = AsyncMock(return_value="s3://mindvault-media/123/media-1.jpg")
+
+        with patch(
+            "mindvault.bookmarks.twitter.media_download._create_http_client",
+            AsyncMock(return_value=AsyncMock()),
+        ), patch(
+            "mindvault.bookmarks.twitter.media_download.download_media_stream",
+            side_effect=lambda client, url, chunk_size: _stream_chunks([b"data"]),
+        ), patch("mindvault.bookmarks.twitter.media_download.tqdm") as progress:
+            result = await download_media(
+                media_list=ExtractedMediaList(media=[item, item.model_copy()]),
+                store=store,
+                skip_existing=False,
+            )
+
+        store.save.assert_awaited_once()
+        progress.assert_called_once_with(total=1, desc="Downloading 1 media files")
+        self.assertEqual(result, {"123": ["s3://mindvault-media/123/media-1.jpg"]})
+
+    async def test_copy_duplicates_stored_object_server_side(self) -> None:
+        store = _make_s3_store()
+        source, item = (
+            ExtractedMedia(tweet_id=tweet_id, media_id="a", media_url="https://example.com/a.jpg", media_type="image")
+            for tweet_id in ("123", "456")
+        )
+
+        location = await store.copy(source, item)
+
+        self.assertEqual(location, "s3://mindvault-media/456/a.jpg")
+        store.s3_client.copy_object.assert_awaited_once_with(
+            Bucket="mindvault-media",
+            Key="456/a.jpg",
+            CopySource={"Bucket": "mindvault-media", "Key": "123/a.jpg"},
+        )
+
+    async def test_download_media_copies_shared_url_unless_already_stored(self) -> None:
+        items = [
+            ExtractedMedia(
+                tweet_id=tweet_id,
+                media_id="media-1",
+                media_url="https://example.com/image.jpg",
+                media_type="image",
+            )
+            for tweet_id in ("123", "456", "789")
+        ]
+        store = MagicMock()
+        store.prepare = AsyncMock()
+        store.get_location = lambda item: f"s3://mindvault-media/{item.tweet_id}/media-1.jpg"
+        store.exists_bulk = AsyncMock(return_value={"s3://mindvault-media/789/media-1.jpg"})
+        store.save = AsyncMock(return_value="s3://mindvault-media/123/media-1.jpg")
+        store.copy = AsyncMock(return_value="s3://mindvault-media/456/media-1.jpg")
+
+        with patch(
+            "mindvault.bookmarks.twitter.media_download._create_http_client",
+            AsyncMock(return_value=AsyncMock()),
+        ), patch(
+            "mindvault.bookmarks.twitter.media_download.download_media_stream",
+            side_effect=lambda client, url, chunk_size: _stream_chunks([b"data"]),
+        ):
+            result = await download_media(
+                media_list=ExtractedMediaList(media=items),
+                store=store,
+                progress_desc="test",
+            )
+
+        store.save.assert_awaited_once()
+        store.copy.assert_awaited_once_with(items[0], items[1])
+        self.assertEqual(
+            result,
+            {
+                "123": ["s3://mindvault-media/123/media-1.jpg"],
+                "456": ["s3://mindvault-media/456/media-1.jpg"],
+                "789": ["s3://mindvault-media/789/media-1.jpg"],
+            },
+        )
+
+    async def test_download_media_appends_count_to_progress_description(self) -> None:
+        item = ExtractedMedia(
+            tweet_id="123",
+            media_id="media-1",
+            media_url="https://example.com/image.jpg",
+            media_type="image",
+        )
+        store = MagicMock()
+        store.prepare = AsyncMock()
+        store.exists = AsyncMock(return_value=True)
+        store.get_location = MagicMock(return_value="s3://mindvault-media/123/media-1.jpg")
+        del store.exists_bulk
+
+        with patch(
+            "mindvault.bookmarks.twitter.media_download._create_http_client",
+            AsyncMock(return_value=AsyncMock()),
+        ), patch("mindvault.bookmarks.twitter.media_download.tqdm") as progress:
+            await download_media(
+                media_list=ExtractedMediaList(media=[item]),
+                store=store,
+                progress_desc="Saving {media} to {bucket}",
+            )
+
+        progress.assert_called_once_with(total=1, desc="Saving {media} to {bucket} (1 files)")
+
+    async def test_download_media_records_store_errors_as_failed_items(self) -> None:
+        items = [
+            ExtractedMedia(
+                tweet_id=tweet_id,
+                media_id="media-1",
+                media_url=f"https://example.com/{tweet_id}.jpg",
+                media_type="image",
+            )
+            for tweet_id in ("123", "456")
+        ]
+
+        async def exists(item):
+            if item.tweet_id == "123":
+                raise ConnectionError("store unavailable")
+            return False
+
+        store = MagicMock()
+        store.prepare = AsyncMock()
+        store.exists = exists
+        store.save = AsyncMock(return_value="s3://mindvault-media/456/media-1.jpg")
+        del store.exists_bulk
+
+        with patch(
+            "mindvault.bookmarks.twitter.media_download._create_http_client",
+            AsyncMock(return_value=AsyncMock()),
+        ), patch(
+            "mindvault.bookmarks.twitter.media_download.download_media_stream",
+            side_effect=lambda client, url, chunk_size: _stream_chunks([b"data"]),
+        ):
+            result = await download_media(
+                media_list=ExtractedMediaList(media=items),
+                store=store,
+                progress_desc="test",
+            )
+
+        store.save.assert_awaited_once()
+        self.assertEqual(result, {"456": ["s3://mindvault-media/456/media-1.jpg"]})
+
+    async def test_download_media_runs_no_more_workers_than_connections(self) -> None:
+        items = [
+            ExtractedMedia(
+                tweet_id=str(tweet_id),
+                media_id="media-1",
+                media_url=f"https://example.com/{tweet_id}.jpg",
+                media_type="image",
+            )
+            for tweet_id in range(6)
+        ]
+        in_flight = []
+        peak = 0
+
+        async def save(item, stream, *, content_type=None):
+            nonlocal peak
+            in_flight.append(item)
+            peak = max(peak, len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(item)
+            return f"s3://mindvault-media/{item.tweet_id}/media-1.jpg"
+
+        store = MagicMock()
+        store.prepare = AsyncMock()
+        store.save = save
+
+        with patch(
+            "mindvault.bookmarks.twitter.media_download._create_http_client",
+            AsyncMock(return_value=AsyncMock()),
+        ) as create_client, patch(
+            "mindvault.bookmarks.twitter.media_download.download_media_stream",
+            side_effect=lambda client, url, chunk_size: _stream_chunks([b"data"]),
+        ):
+            result = await download_media(
+                media_list=ExtractedMediaList(media=items),
+                store=store,
+                max_connections=2,
+                skip_existing=False,
+                progress_desc="test",
+            )
+
+        self.assertEqual(create_client.await_args.kwargs["max_connections"], 2)
+        self.assertEqual(peak, 2)
+        self.assertEqual(len(result), 6)
+
+    async def test_download_media_reuses_client_on_same_event_loop(self) -> None:
+        media_list = ExtractedMediaList(
+            media=[
+                ExtractedMedia(
+                    tweet_id="123",
+                    media_id="media-1",
+                    media_url="https://example.com/image.jpg",
+                    media_type="image",
+                )
+            ]
+        )
+
+        class ExistingStore:
+            async def prepare(self) -> None:
+                return None
+
+            def get_location(self, _item):
+                return "s3://mindvault-media/123/media-1.jpg"
+
+            async def exists(self, _item) -> bool:
+                return True
+
+        client = AsyncMock(is_closed=False)
+        create_client = AsyncMock(return_value=client)
+
+        with patch(
+            "mindvault.bookmarks.twitter.media_download._create_http_client",
+            create_client,
+        ):
+            for _ in range(2):
+                await download_media(
+                    media_list=media_list,
+                    store=ExistingStore(),
+                    progress_desc="test",
+                )
+            await close_shared_http_client()
+
+        create_client.assert_awaited_once()
+        client.aclose.assert_awaited_once()
+
+
+class SharedHttpClientTests(unittest.TestCase):
+    def test_shared_client_is_closed_when_asyncio_run_finishes(self) -> None:
+        client = asyncio.run(_get_shared_client())
+
+        self.assertTrue(client.is_closed)
+
 
 class BlobStorageUriTests(unittest.TestCase):
     def test_s3_uri_format(self) -> None:
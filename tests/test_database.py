@@ -0,0 +1,95 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+
+os.environ.setdefault("TWITTER_CT0", "test-ct0")
+os.environ.setdefault("TWITTER_AUTH_TOKEN", "test-auth")
+os.environ.setdefault("VALIDATE_EXTERNAL_SERVICES_ON_STARTUP", "false")
+
+from mindvault.bookmarks.twitter import database
+from mindvault.bookmarks.twitter.database import Base, Tweet
+
+
+class TweetDatabaseTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        for name, value in (
+            ("engine", self.engine),
+            ("SessionLocal", sessionmaker(bind=self.engine)),
+        ):
+            patcher = patch.object(database, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _stored_ids(self) -> list:
+        with self.engine.connect() as connection:
+            return sorted(connection.execute(select(Tweet.tweet_id)).scalars())
+
+    def test_tweet_table_is_created_without_rowid(self) -> None:
+        with self.engine.connect() as connection:
+            ddl = connection.execute(
+                text("SELECT sql FROM sqlite_master WHERE name = 'tweet'")
+            ).scalar_one()
+
+        self.assertIn("WITHOUT ROWID", ddl)
+
+    def test_save_tweet_ids_inserts_all_ids(self) -> None:
+        saved = database.save_tweet_ids_to_db(["1", "2", "3"])
+
+        self.assertEqual(saved, 3)
+        self.assertEqual(self._stored_ids(), ["1", "2", "3"])
+
+    def test_save_tweet_ids_ignores_existing_and_duplicate_ids(self) -> None:
+        database.save_tweet_ids_to_db(["1"])
+        database.save_tweet_ids_to_db(["1", "2", "2"])
+
+        self.assertEqual(self._stored_ids(), ["1", "2"])
+
+    def test_save_tweet_ids_skips_existing_ids_without_on_conflict(self) -> None:
+        database.save_tweet_ids_to_db(["1"])
+
+        with patch.object(self.engine.dialect, "name", "mysql"):
+            saved = database.save_tweet_ids_to_db(["1", "2", "2"])
+
+        self.assertEqual(saved, 1)
+        self.assertEqual(self._stored_ids(), ["1", "2"])
+
+    def test_save_tweet_ids_with_no_ids_is_noop(self) -> None:
+        self.assertEqual(database.save_tweet_ids_to_db([]), 0)
+        self.assertEqual(self._stored_ids(), [])
+
+    def test_get_existing_tweet_ids_returns_all_ids(self) -> None:
+        database.save_tweet_ids_to_db(["1", "2", "3"])
+
+        self.assertEqual(database.get_existing_tweet_ids(), {"1", "2", "3"})
+
+    def test_filter_new_tweet_ids_returns_only_missing_ids(self) -> None:
+        database.save_tweet_ids_to_db(["1", "2"])
+
+        self.assertEqual(database.filter_new_tweet_ids(["1", "2", "3", "4"]), {"3", "4"})
+
+    def test_filter_new_tweet_ids_spans_multiple_chunks(self) -> None:
+        existing = [str(i) for i in range(0, 1200, 2)]
+        database.save_tweet_ids_to_db(existing)
+
+        with patch.object(database, "IN_CLAUSE_CHUNK_SIZE", 100):
+            pending = database.filter_new_tweet_ids(str(i) for i in range(1200))
+
+        self.assertEqual(pending, {str(i) for i in range(1, 1200, 2)})
+
+    def test_filter_new_tweet_ids_sees_ids_written_by_other_connections(self) -> None:
+        self.assertEqual(database.filter_new_tweet_ids(["1"]), {"1"})
+
+        # e.g. another process sharing the database
+        with self.engine.begin() as connection:
+            connection.execute(Tweet.__table__.insert(), [{"tweet_id": "1"}])
+
+        self.assertEqual(database.filter_new_tweet_ids(["1"]), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,366 @@
+import os
+import unittest
+
+from pydantic import ValidationError
+
+os.environ.setdefault("TWITTER_CT0", "test-ct0")
+os.environ.setdefault("TWITTER_AUTH_TOKEN", "test-auth")
+os.environ.setdefault("VALIDATE_EXTERNAL_SERVICES_ON_STARTUP", "false")
+
+from mindvault.bookmarks.twitter.extract import (
+    MediaUrlHandling,
+    _extract_article_content,
+    extract_tweet_data,
+)
+from mindvault.bookmarks.twitter.schema import Article, ItemContent
+
+_SIZE = {"h": 1, "w": 1, "resize": "fit"}
+
+
+def _article(blocks, entity_map=(), media_entities=()):
+    return Article.model_validate(
+        {
+            "article_results": {
+                "result": {
+                    "rest_id": "1",
+                    "id": "1",
+                    "title": "Title",
+                    "content_state": {"blocks": blocks, "entityMap": list(entity_map)},
+                    "media_entities": list(media_entities),
+                }
+            }
+        }
+    )
+
+
+def _atomic(key):
+    return {"key": "a", "text": " ", "type": "atomic", "entityRanges": [{"key": key}]}
+
+
+def _user(name):
+    return {
+        "user_results": {
+            "result": {
+                "__typename": "User",
+                "id": name,
+                "rest_id": name,
+                "core": {"created_at": "c", "name": name.title(), "screen_name": name},
+                "legacy": {
+                    "default_profile": True,
+                    "default_profile_image": False,
+                    "description": "",
+                    "entities": {},
+                    "fast_followers_count": 0,
+                    "favourites_count": 0,
+                    "followers_count": 0,
+                    "friends_count": 0,
+                    "has_custom_timelines": False,
+                    "is_translator": False,
+                    "listed_count": 0,
+                    "media_count": 0,
+                    "normal_followers_count": 0,
+                    "pinned_tweet_ids_str": [],
+                },
+            }
+        }
+    }
+
+
+def _media(media_id, media_type, duration_millis=None):
+    media = {
+        "display_url": "pic.x.com/m",
+        "expanded_url": f"https://x.com/m/{media_id}",
+        "id_str": media_id,
+        "indices": [7, 21],
+        "media_key": f"k{media_id}",
+        "media_url_https": f"https://pbs.twimg.com/{media_id}.jpg",
+        "type": media_type,
+        "url": "https://t.co/m",
+        "ext_media_availability": {"status": "ok"},
+        "sizes": {"large": _SIZE, "medium": _SIZE, "small": _SIZE, "thumb": _SIZE},
+        "original_info": {"height": 1, "width": 1, "focus_rects": []},
+    }
+    if media_type != "photo":
+        media["video_info"] = {
+            "aspect_ratio": [1, 1],
+            "duration_millis": duration_millis,
+            "variants": [{"content_type": "video/mp4", "url": "https://v/1.mp4", "bitrate": 1}],
+        }
+    return media
+
+
+def _tweet(rest_id, screen_name, *, media=None, quoted=None):
+    entities = {
+        "user_mentions": [
+            {"id_str": "1", "name": "Alice", "screen_name": "alice", "indices": [0, 6]}
+        ],
+        "urls": [
+            {
+                "display_url": "example.com",
+                "expanded_url": "https://example.com/a",
+                "url": "https://t.co/u",
+                "indices": [26, 40],
+            }
+        ],
+        "hashtags": [],
+        "symbols": [],
+    }
+    if media is None:
+        media = [_media("1", "photo"), _media("2", "video", duration_millis=2500)]
+    if media:
+        entities["media"] = media
+    tweet = {
+        "__typename": "Tweet",
+        "rest_id": rest_id,
+        "has_birdwatch_notes": False,
+        "core": _user(screen_name),
+        "unmention_data": {},
+        "edit_control": {},
+        "is_translatable": False,
+        "views": {},
+        "source": "web",
+        "legacy": {
+            "created_at": "Mon Jan 01 00:00:00 +0000 2024",
+            "conversation_id_str": rest_id,
+            "display_text_range": [0, 1],
+            "entities": entities,
+            "favorite_count": 3,
+            "favorited": False,
+            "full_text": "@alice https://t.co/m see https://t.co/u",
+            "is_quote_status": quoted is not None,
+            "lang": "en",
+            "quote_count": 0,
+            "reply_count": 4,
+            "retweet_count": 5,
+            "retweeted": False,
+        },
+    }
+    if quoted is not None:
+        tweet["legacy"]["quoted_status_permalink"] = {
+            "url": "https://t.co/q",
+            "expanded": "https://x.com/q/9",
+            "display": "x.com/q/9",
+        }
+        tweet["quoted_status_result"] = {"result": quoted}
+    return tweet
+
+
+def _item(result):
+    return ItemContent.model_validate(
+        {
+            "itemType": "TimelineTweet",
+            "__typename": "TimelineTweet",
+            "tweetDisplayType": "Tweet",
+            "tweet_results": {"result": result},
+        }
+    )
+
+
+class ExtractArticleContentTests(unittest.TestCase):
+    def test_renders_each_block_type(self) -> None:
+        blocks = [
+            {"key": "b", "text": f" {block_type} text ", "type": block_type}
+            for block_type in (
+                "header-one",
+                "header-two",
+                "header-three",
+                "unordered-list-item",
+                "ordered-list-item",
+                "blockquote",
+                "unstyled",
+                "code-block",
+            )
+        ]
+        blocks += [
+            {"key": "b", "text": "  ", "type": "unstyled"},
+            {"key": "b", "text": "  ", "type": "header-two"},
+        ]
+
+        text, media = _extract_article_content(_article(blocks))
+
+        self.assertEqual(
+            text,
+            "\n".join(
+                [
+                    "# Title",
+                    "",
+                    "# header-one text",
+                    "## header-two text",
+                    "### header-three text",
+                    "• unordered-list-item text",
+                    "- ordered-list-item text",
+                    "> blockquote text",
+                    "unstyled text",
+                    "code-block text",
+                    "## ",
+                ]
+            ),
+        )
+        self.assertEqual(media, [])
+
+    def test_renders_each_atomic_entity_type(self) -> None:
+        entity_map = [
+            {"key": "0", "value": {"type": "MEDIA", "data": {"mediaItems": [{"mediaId": "m1"}]}}},
+            {"key": "1", "value": {"type": "MEDIA", "data": {"mediaItems": [{"mediaId": "m2"}]}}},
+            {"key": "2", "value": {"type": "MEDIA", "data": {"mediaItems": []}}},
+            {"key": "3", "value": {"type": "MARKDOWN", "data": {"markdown": "```py\nx = 1\n```"}}},
+            {"key": "4", "value": {"type": "MARKDOWN", "data": {}}},
+            {"key": "5", "value": {"type": "DIVIDER"}},
+            {"key": "6", "value": {"type": "TWEET", "data": {"tweetId": "42"}}},
+            {"key": "7", "value": {"type": "TWEET", "data": {}}},
+            {"key": "8", "value": {"type": "LATEX"}},
+            # Only the first entity with a key is used
+            {"key": "5", "value": {"type": "TWEET", "data": {"tweetId": "43"}}},
+        ]
+        media_entities = [
+            {
+                "id": "1",
+                "media_key": "k1",
+                "media_id": "m1",
+                "media_info": {"__typename": "ApiImage", "original_img_url": "https://i/1.jpg"},
+            },
+            {
+                "id": "2",
+                "media_key": "k2",
+                "media_id": "m2",
+                "media_info": {
+                    "__typename": "ApiVideo",
+                    "preview_image": {
+                        "original_img_url": "https://i/2.jpg",
+                        "original_img_height": 1,
+                        "original_img_width": 1,
+                    },
+                },
+            },
+        ]
+        blocks = [_atomic(key) for key in range(9)]
+        blocks += [_atomic(99), {"key": "a", "text": " ", "type": "atomic"}]
+
+        text, media = _extract_article_content(_article(blocks, entity_map, media_entities))
+
+        self.assertEqual(
+            text.split("\n"),
+            [
+                "# Title",
+                "",
+                "![Media](https://i/1.jpg)",
+                "![Media](https://i/2.jpg)",
+                "![Media](unknown)",
+                "",
+                "```py",
+                "x = 1",
+                "```",
+                "",
+                "[CODE SNIPPET]",
+                "",
+                "---",
+                "",
+                "[Embedded Tweet: https://x.com/i/status/42]",
+                "[Embedded Tweet]",
+                "[LATEX]",
+                "[UNKNOWN ELEMENT]",
+            ],
+        )
+        self.assertEqual([entity.media_id for entity in media], ["m1", "m2"])
+
+    def test_falls_back_to_preview_text_without_content_state(self) -> None:
+        article = Article.model_validate(
+            {
+                "article_results": {
+                    "result": {"rest_id": "1", "id": "1", "title": "Title", "preview_text": "Preview"}
+                }
+            }
+        )
+
+        self.assertEqual(_extract_article_content(article), ("Title\n\nPreview", []))
+
+
+class ExtractTweetDataTests(unittest.TestCase):
+    def test_extracts_tweet_fields(self) -> None:
+        tweet = extract_tweet_data(_item(_tweet("1", "bob")))
+
+        self.assertEqual(tweet.id, "1")
+        self.assertEqual((tweet.username, tweet.actual_name), ("bob", "Bob"))
+        self.assertEqual(tweet.text, "@alice https://t.co/m see https://example.com/a")
+        self.assertEqual(
+            (tweet.favourite_count, tweet.reply_count, tweet.retweet_count), (3, 4, 5)
+        )
+        self.assertEqual(tweet.created_at, "Mon Jan 01 00:00:00 +0000 2024")
+        self.assertEqual(tweet.urls, ["https://example.com/a"])
+        self.assertEqual(tweet.mentions, ["alice"])
+        self.assertEqual(tweet.media_urls, ["https://x.com/m/1", "https://x.com/m/2"])
+        self.assertEqual(tweet.video_durations, {"https://x.com/m/2": 2.5})
+        self.assertEqual([media.id_str for media in tweet.media], ["1", "2"])
+        self.assertIsNone(tweet.quoted_tweet)
+
+    def test_media_url_handling_rewrites_media_links(self) -> None:
+        item = _item(_tweet("1", "bob", media=[_media("1", "photo")]))
+
+        removed = extract_tweet_data(item, MediaUrlHandling.REMOVE)
+        replaced = extract_tweet_data(item, MediaUrlHandling.REPLACE)
+
+        self.assertEqual(removed.text, "@alice  see https://example.com/a")
+        self.assertEqual(
+            replaced.text, "@alice https://x.com/m/1 see https://example.com/a"
+        )
+
+    def test_extracts_quoted_tweet(self) -> None:
+        quoted = {
+            "__typename": "TweetWithVisibilityResults",
+            "tweet": {
+                key: value
+                for key, value in _tweet("9", "carol").items()
+                if key != "__typename"
+            },
+        }
+
+        tweet = extract_tweet_data(
+            _item(_tweet("1", "bob", media=[], quoted=quoted))
+        )
+
+        self.assertEqual(tweet.media, [])
+        self.assertEqual(tweet.quoted_tweet.id, "9")
+        self.assertEqual(tweet.quoted_tweet.username, "carol")
+        self.assertEqual(tweet.quoted_tweet.link, "https://x.com/q/9")
+        self.assertEqual(tweet.quoted_tweet.urls, ["https://example.com/a"])
+        self.assertEqual(tweet.quoted_tweet.mentions, ["alice"])
+        self.assertEqual(
+            tweet.quoted_tweet.video_durations, {"https://x.com/m/2": 2.5}
+        )
+        self.assertEqual([media.id_str for media in tweet.quoted_tweet.media], ["1", "2"])
+
+    def test_tombstoned_quote_and_tweet_get_placeholders(self) -> None:
+        tweet = extract_tweet_data(
+            _item(_tweet("1", "bob", quoted={"__typename": "TweetTombstone"}))
+        )
+        tombstone = extract_tweet_data(_item({"__typename": "TweetTombstone"}))
+
+        self.assertEqual(tweet.quoted_tweet.text, "[Quoted tweet unavailable]")
+        self.assertEqual(tweet.quoted_tweet.media, [])
+        self.assertEqual(tombstone.text, "[Tweet unavailable]")
+        self.assertEqual(tombstone.media, [])
+
+    def test_malformed_tweet_values_fail_validation(self) -> None:
+        cases = (
+            ("favorite_count", lambda tweet: setattr(tweet.legacy, "favorite_count", None)),
+            ("rest_id", lambda tweet: setattr(tweet, "rest_id", 123)),
+            ("created_at", lambda tweet: setattr(tweet.legacy, "created_at", None)),
+        )
+        for field, corrupt in cases:
+            with self.subTest(field=field):
+                item = _item(_tweet("1", "bob"))
+                corrupt(item.tweet_results.result)
+
+                with self.assertRaises(ValidationError):
+                    extract_tweet_data(item)
+
+    def test_malformed_quoted_tweet_fails_validation(self) -> None:
+        item = _item(_tweet("1", "bob", quoted=_tweet("9", "carol")))
+        item.tweet_results.result.quoted_status_result.result.rest_id = None
+
+        with self.assertRaises(ValidationError):
+            extract_tweet_data(item)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,214 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+os.environ.setdefault("TWITTER_CT0", "test-ct0")
+os.environ.setdefault("TWITTER_AUTH_TOKEN", "test-auth")
+os.environ.setdefault("VALIDATE_EXTERNAL_SERVICES_ON_STARTUP", "false")
+
+from mindvault.bookmarks.twitter import download_tweet_media
+from mindvault.bookmarks.twitter.download_tweet_media import FileSystemMediaStore
+from mindvault.bookmarks.twitter.extract import ExtractedMedia, ExtractedMediaList
+from mindvault.bookmarks.twitter.media_download import download_media
+
+
+async def _stream_chunks(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _failing_stream(chunks):
+    for chunk in chunks:
+        yield chunk
+    raise IOError("connection reset")
+
+
+class FileSystemMediaStoreTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.store = FileSystemMediaStore(temp_dir.name)
+        self.item = ExtractedMedia(
+            tweet_id="123",
+            media_id="media-1",
+            media_url="https://example.com/image.jpg",
+            media_type="image",
+        )
+
+    async def test_save_writes_all_chunks(self) -> None:
+        location = await self.store.save(self.item, _stream_chunks([b"abc", b"def"]))
+
+        self.assertEqual(location, Path(self.store.base_dir) / "123" / "media-1.jpg")
+        self.assertEqual(location.read_bytes(), b"abcdef")
+        self.assertTrue(await self.store.exists(self.item))
+        self.assertEqual(os.listdir(location.parent), ["media-1.jpg"])
+
+    def test_write_file_leaves_no_file_when_write_fails(self) -> None:
+        file_path = os.path.join(self.store.base_dir, "media.jpg")
+
+        with self.assertRaises(TypeError):
+            download_tweet_media._write_file(file_path, [b"abc", "not bytes"])
+
+        self.assertEqual(os.listdir(self.store.base_dir), [])
+
+    async def test_exists_is_false_for_missing_and_empty_files(self) -> None:
+        self.assertFalse(await self.store.exists(self.item))
+
+        location = self.store.get_location(self.item)
+        location.parent.mkdir(parents=True)
+        location.touch()
+        self.assertFalse(await self.store.exists(self.item))
+
+        location.write_bytes(b"abc")
+        self.assertTrue(await self.store.exists(self.item))
+
+    async def test_exists_can_stat_from_a_worker_thread(self) -> None:
+        store = FileSystemMediaStore(self.store.base_dir, use_thread_for_stat=True)
+        location = store.get_location(self.item)
+        location.parent.mkdir(parents=True)
+        location.write_bytes(b"abc")
+
+        with patch.object(
+            download_tweet_media.asyncio, "to_thread", wraps=asyncio.to_thread
+        ) as to_thread:
+            self.assertTrue(await store.exists(self.item))
+
+        to_thread.assert_called_once_with(
+            download_tweet_media._is_non_empty_file, str(location)
+        )
+
+    async def test_download_tweet_media_passes_stat_mode_to_store(self) -> None:
+        media_list = ExtractedMediaList(media=[self.item])
+
+        with patch.object(
+            download_tweet_media, "download_media", AsyncMock(return_value={})
+        ) as download, self.assertWarns(DeprecationWarning):
+            await download_tweet_media.download_tweet_media(
+                media_list, output_dir=self.store.base_dir, use_thread_for_stat=True
+            )
+
+        self.assertTrue(download.await_args.kwargs["store"].use_thread_for_stat)
+        self.assertNotIn("use_thread_for_stat", download.await_args.kwargs)
+
+    async def test_download_media_copies_media_shared_by_two_tweets(self) -> None:
+        shared = self.item.model_copy(update={"tweet_id": "456"})
+        stream = MagicMock(side_effect=lambda client, url, chunk_size: _stream_chunks([b"abc"]))
+
+        with patch(
+            "mindvault.bookmarks.twitter.media_download._create_http_client",
+            AsyncMock(return_value=AsyncMock()),
+        ), patch("mindvault.bookmarks.twitter.media_download.download_media_stream", stream):
+            result = await download_media(
+                ExtractedMediaList(media=[self.item, shared]), self.store
+            )
+
+        stream.assert_called_once()
+        self.assertEqual(
+            result,
+            {
+                "123": [self.store.get_location(self.item)],
+                "456": [self.store.get_location(shared)],
+            },
+        )
+        self.assertEqual(self.store.get_location(shared).read_bytes(), b"abc")
+        self.assertEqual(os.listdir(self.store.get_location(shared).parent), ["media-1.jpg"])
+
+    async def test_save_flushes_large_files_in_windows(self) -> None:
+        chunks = [bytes([i]) * 3 for i in range(10)]
+
+        with patch.object(download_tweet_media, "_FLUSH_BYTES", 4):
+            location = await self.store.save(self.item, _stream_chunks(chunks))
+
+        self.assertEqual(location.read_bytes(), b"".join(chunks))
+        self.assertEqual(os.listdir(location.parent), ["media-1.jpg"])
+
+    async def test_save_removes_partial_file_when_flushed_stream_fails(self) -> None:
+        with patch.object(download_tweet_media, "_FLUSH_BYTES", 4):
+            with self.assertRaises(IOError):
+                await self.store.save(self.item, _failing_stream([b"abcd", b"efgh"]))
+
+        self.assertFalse(self.store.get_location(self.item).exists())
+
+    async def test_save_cleans_up_when_cancelled_mid_stream(self) -> None:
+        opened = []
+        real_open = open
+
+        def tracking_open(*args, **kwargs):
+            fp = real_open(*args, **kwargs)
+            opened.append(fp)
+            return fp
+
+        async def cancelled_stream():
+            yield b"abcd"
+            yield b"efgh"
+            raise asyncio.CancelledError()
+
+        with patch.object(download_tweet_media, "_FLUSH_BYTES", 4), patch(
+            "builtins.open", tracking_open
+        ):
+            with self.assertRaises(asyncio.CancelledError):
+                await self.store.save(self.item, cancelled_stream())
+
+        self.assertEqual(len(opened), 1)
+        self.assertTrue(opened[0].closed)
+        location = self.store.get_location(self.item)
+        self.assertEqual(os.listdir(location.parent), [])
+        self.assertFalse(await self.store.exists(self.item))
+
+    async def test_save_waits_for_in_flight_write_when_cancelled(self) -> None:
+        started = threading.Event()
+        release = threading.Event()
+        written = []
+        real_open = open
+
+        class SlowFile:
+            def __init__(self, *args, **kwargs) -> None:
+                self.fp = real_open(*args, **kwargs)
+
+            def writelines(self, chunks) -> None:
+                started.set()
+                release.wait(5)
+                # Raises ValueError if the file was closed under the thread
+                self.fp.writelines(chunks)
+                written.append(b"".join(chunks))
+
+            def close(self) -> None:
+                self.fp.close()
+
+        with patch.object(download_tweet_media, "_FLUSH_BYTES", 4), patch(
+            "builtins.open", SlowFile
+        ):
+            save = asyncio.create_task(
+                self.store.save(self.item, _stream_chunks([b"abcd", b"efgh"]))
+            )
+            while not started.is_set():
+                await asyncio.sleep(0.001)
+            save.cancel()
+            asyncio.get_running_loop().call_later(0.05, release.set)
+            with self.assertRaises(asyncio.CancelledError):
+                await save
+
+        self.assertEqual(written, [b"abcd"])
+        location = self.store.get_location(self.item)
+        self.assertEqual(os.listdir(location.parent), [])
+
+    async def test_save_rejects_empty_stream(self) -> None:
+        with self.assertRaises(IOError):
+            await self.store.save(self.item, _stream_chunks([]))
+
+        self.assertFalse(self.store.get_location(self.item).exists())
+        self.assertFalse(await self.store.exists(self.item))
+
+    async def test_save_removes_partial_file_when_stream_fails(self) -> None:
+        with self.assertRaises(IOError):
+            await self.store.save(self.item, _failing_stream([b"abc"]))
+
+        self.assertFalse(self.store.get_location(self.item).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
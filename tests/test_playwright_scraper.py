@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from playwright.sync_api import Error
+
+os.environ.setdefault("TWITTER_CT0", "test-ct0")
+os.environ.setdefault("TWITTER_AUTH_TOKEN", "test-auth")
+os.environ.setdefault("VALIDATE_EXTERNAL_SERVICES_ON_STARTUP", "false")
+
+from mindvault.bookmarks.twitter.scraper.base import TweetNotFoundError
+from mindvault.bookmarks.twitter.scraper.playwright_scraper import PlaywrightScraper
+
+
+class GetTweetDataPageCleanupTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.scraper = PlaywrightScraper(input_file=Path(temp_dir.name) / "ids.json")
+
+        self.page = MagicMock()
+        browser = MagicMock()
+        browser.contexts[0].new_page.return_value = self.page
+        patcher = patch.object(self.scraper, "_get_browser", return_value=browser)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assert_page_released(self) -> None:
+        self.page.remove_listener.assert_called_once_with(
+            "response", self.scraper.handle_response
+        )
+        self.page.close.assert_called_once()
+
+    def test_page_is_released_when_playwright_fails_mid_scrape(self) -> None:
+        self.page.wait_for_event.side_effect = Error("Target page has been closed")
+
+        with self.assertRaises(TweetNotFoundError):
+            self.scraper.get_tweet_data(123)
+
+        self.assert_page_released()
+
+    def test_page_is_released_when_navigation_fails(self) -> None:
+        self.page.goto.side_effect = Error("net::ERR_CONNECTION_RESET")
+
+        with self.assertRaises(TweetNotFoundError):
+            self.scraper.get_tweet_data(123)
+
+        self.assert_page_released()
+
+
+if __name__ == "__main__":
+    unittest.main()
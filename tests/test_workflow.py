@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+os.environ.setdefault("TWITTER_CT0", "test-ct0")
+os.environ.setdefault("TWITTER_AUTH_TOKEN", "test-auth")
+os.environ.setdefault("VALIDATE_EXTERNAL_SERVICES_ON_STARTUP", "false")
+
+from mindvault.bookmarks.twitter import workflow
+from mindvault.bookmarks.twitter.workflow import WorkflowManager
+
+
+class ScrapeTweetsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        cwd = os.getcwd()
+        os.chdir(temp_dir.name)
+        self.addCleanup(os.chdir, cwd)
+
+        self.scraper = MagicMock()
+        self.saved_batches = []
+        for name, value in (
+            ("create_database", MagicMock()),
+            ("PlaywrightScraper", MagicMock(return_value=self.scraper)),
+            ("get_tweet_by_id", MagicMock(return_value=None)),
+            (
+                "save_tweet_ids_to_db",
+                MagicMock(side_effect=lambda ids: self.saved_batches.append(list(ids))),
+            ),
+        ):
+            patcher = patch.object(workflow, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch.object(type(workflow.settings), "setup_directories")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.manager = WorkflowManager()
+        self.manager.extract_and_save_tweet_data = MagicMock()
+
+    def test_processed_ids_are_saved_in_batches(self) -> None:
+        with patch.object(workflow, "TWEET_ID_SAVE_BATCH_SIZE", 2):
+            processed = self.manager.scrape_tweets({"1", "2", "3", "4", "5"})
+
+        self.assertEqual(processed, ["1", "2", "3", "4", "5"])
+        self.assertEqual(self.saved_batches, [["1", "2"], ["3", "4"], ["5"]])
+        self.scraper.close.assert_called_once()
+
+    def test_failed_extractions_are_not_saved(self) -> None:
+        self.manager.extract_and_save_tweet_data.side_effect = [
+            None,
+            ValueError("bad tweet"),
+            None,
+        ]
+
+        self.manager.scrape_tweets({"1", "2", "3"})
+
+        self.assertEqual(self.saved_batches, [["1", "3"]])
+
+    def test_remaining_ids_are_saved_when_close_fails(self) -> None:
+        self.scraper.close.side_effect = RuntimeError("browser gone")
+
+        with self.assertRaises(RuntimeError):
+            self.manager.scrape_tweets({"1", "2"})
+
+        self.assertEqual(self.saved_batches, [["1", "2"]])
+
+
+if __name__ == "__main__":
+    unittest.main()